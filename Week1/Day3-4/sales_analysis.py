@@ -2,59 +2,82 @@
 
 import numpy as np
 
-# 1. Generate sample sales data
-np.random.seed(42)  # for reproducibility
-
-# Generate data for 12 months and 5 products
-months = 12
-products = 5
-
-# Create a 2D array of sales data: rows are months, columns are products
-sales_data = np.random.randint(100, 1000, size=(months, products))
-
-print("Sample sales data (rows: months, columns: products):")
-print(sales_data)
-
-# 2. Perform basic statistical analysis
-print("\nBasic statistical analysis:")
-print(f"Total sales: {np.sum(sales_data)}")
-print(f"Average monthly sales: {np.mean(sales_data)}")
-print(f"Highest monthly sales: {np.max(sales_data)}")
-print(f"Lowest monthly sales: {np.min(sales_data)}")
-
-# 3. Calculate monthly and product-wise totals
-monthly_totals = np.sum(sales_data, axis=1)
-product_totals = np.sum(sales_data, axis=0)
-
-print("\nMonthly sales totals:")
-print(monthly_totals)
-
-print("\nProduct-wise sales totals:")
-print(product_totals)
-
-# 4. Find the best-selling product for each month
-best_selling_products = np.argmax(sales_data, axis=1)
-print("\nBest-selling product for each month (0-indexed):")
-print(best_selling_products)
-
-# 5. Calculate the percentage of sales for each product
-product_percentages = (product_totals / np.sum(sales_data)) * 100
-print("\nPercentage of sales for each product:")
-print(product_percentages)
-
-# 6. Find months with above-average sales
-average_sales = np.mean(sales_data)
-above_average_months = np.where(monthly_totals > average_sales)[0]
-print("\nMonths with above-average sales (0-indexed):")
-print(above_average_months)
-
-# 7. Calculate the correlation between products
-correlation_matrix = np.corrcoef(sales_data.T)
-print("\nCorrelation matrix between products:")
-print(correlation_matrix)
-
-# 8. Predict next month's sales (simple moving average)
-last_3_months = sales_data[-3:, :]
-next_month_prediction = np.mean(last_3_months, axis=0)
-print("\nPredicted sales for next month (simple moving average):")
-print(next_month_prediction)
\ No newline at end of file
+
+# Everything runs from main(), so importing this file doesn't do any work
+def main():
+    # 1. Generate sample sales data
+    # default_rng() is NumPy's newer random Generator (PCG64): faster than the
+    # legacy np.random.* functions and seeded through its own object
+    rng = np.random.default_rng(42)  # for reproducibility
+
+    # Generate data for 12 months and 5 products
+    months = 12
+    products = 5
+
+    # Create a 2D array of sales data: rows are months, columns are products
+    # int16 is plenty for values below 1000 and takes a quarter of the memory of
+    # int64. np.sum() still accumulates small integer types in int64, so the
+    # totals below can't overflow
+    sales_data = rng.integers(100, 1000, size=(months, products), dtype=np.int16)
+
+    print("Sample sales data (rows: months, columns: products):")
+    print(sales_data)
+
+    # 2. Perform basic statistical analysis
+    # Every np.sum/np.mean call reads the whole array again, so I compute the
+    # monthly totals once and derive the grand total and the mean from them
+    monthly_totals = np.sum(sales_data, axis=1)
+    total_sales = np.sum(monthly_totals)
+    average_sales = total_sales / sales_data.size
+
+    print("\nBasic statistical analysis:")
+    print(f"Total sales: {total_sales}")
+    print(f"Average monthly sales: {average_sales}")
+    print(f"Highest monthly sales: {np.max(sales_data)}")
+    print(f"Lowest monthly sales: {np.min(sales_data)}")
+
+    # 3. Calculate monthly and product-wise totals
+    product_totals = np.sum(sales_data, axis=0)
+
+    print("\nMonthly sales totals:")
+    print(monthly_totals)
+
+    print("\nProduct-wise sales totals:")
+    print(product_totals)
+
+    # 4. Find the best-selling product for each month
+    best_selling_products = np.argmax(sales_data, axis=1)
+    print("\nBest-selling product for each month (0-indexed):")
+    print(best_selling_products)
+
+    # 5. Calculate the percentage of sales for each product
+    product_percentages = (product_totals / total_sales) * 100
+    print("\nPercentage of sales for each product:")
+    print(product_percentages)
+
+    # 6. Find months with above-average sales
+    above_average_months = np.where(monthly_totals > average_sales)[0]
+    print("\nMonths with above-average sales (0-indexed):")
+    print(above_average_months)
+
+    # 7. Calculate the correlation between products
+    # Doing by hand what np.corrcoef() does, with fewer temporary arrays:
+    # center each product's sales, scale them to unit length, and then a single
+    # matrix multiplication gives every pairwise correlation at once.
+    # float32 is precise enough here and halves the data the multiplication reads
+    centered = sales_data.T.astype(np.float32)
+    centered -= centered.mean(axis=1, keepdims=True)
+    centered /= np.linalg.norm(centered, axis=1, keepdims=True)
+    correlation_matrix = centered @ centered.T
+    print("\nCorrelation matrix between products:")
+    print(correlation_matrix)
+
+    # 8. Predict next month's sales (simple moving average)
+    last_3_months = sales_data[-3:, :]
+    next_month_prediction = np.mean(last_3_months, axis=0)
+    print("\nPredicted sales for next month (simple moving average):")
+    print(next_month_prediction)
+
+
+if __name__ == "__main__":
+    main()
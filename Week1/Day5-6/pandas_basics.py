@@ -23,7 +23,9 @@ print(df)
 
 # Create a DataFrame with a DatetimeIndex
 dates = pd.date_range('20230101', periods=6)
-df_2 = pd.DataFrame(np.random.randn(6, 4), index=dates, columns=list('ABCD'))
+# np.asfortranarray() lays the values out column by column, which is how pandas
+# stores them, so each column ends up in one contiguous block of memory
+df_2 = pd.DataFrame(np.asfortranarray(np.random.randn(6, 4)), index=dates, columns=list('ABCD'))
 print("\nDataFrame with DatetimeIndex:")
 print(df_2)
 
@@ -1,6 +1,10 @@
 # matplotlib_overview.py - My exploration of different plot types and customizations in Matplotlib
 
 import numpy as np
+import matplotlib
+# The Agg backend only renders to image files, so no GUI window toolkit gets set up
+# (we only save the plots, we never show them). It has to be chosen before importing pyplot
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import os
 
@@ -8,10 +12,17 @@ import os
 image_dir = 'visualization_assets'
 os.makedirs(image_dir, exist_ok=True)
 
+# Creating a figure (and its canvas) has a cost, so all plots share this one figure
+fig = plt.figure(figsize=(10, 6))
+
+# Function to start a new plot on the shared figure
+def new_plot():
+    fig.clf()  # Removes everything from the previous plot, including colorbars
+    return fig.add_subplot()
+
 # Function to save figures
 def save_figure(fig, filename):
     fig.savefig(os.path.join(image_dir, filename))
-    plt.close(fig)
     print(f"Saved '{filename}' in the '{image_dir}' directory")
 
 # Generate some sample data
@@ -23,7 +34,7 @@ values = [23, 48, 15, 31, 57]
 data = np.random.randn(1000)
 
 # 1. Line Plot
-fig, ax = plt.subplots(figsize=(10, 6))
+ax = new_plot()
 ax.plot(x, y1, label='sin(x)')
 ax.plot(x, y2, label='cos(x)')
 ax.set_title('Line Plot: Trigonometric Functions')
@@ -34,16 +45,16 @@ ax.grid(True)
 save_figure(fig, 'line_plot.png')
 
 # 2. Scatter Plot
-fig, ax = plt.subplots(figsize=(10, 6))
+ax = new_plot()
 scatter = ax.scatter(x, y1, c=y2, cmap='viridis', s=50)
-plt.colorbar(scatter, label='cos(x)')
+fig.colorbar(scatter, label='cos(x)')
 ax.set_title('Scatter Plot: sin(x) vs x, colored by cos(x)')
 ax.set_xlabel('x')
 ax.set_ylabel('sin(x)')
 save_figure(fig, 'scatter_plot.png')
 
 # 3. Bar Plot
-fig, ax = plt.subplots(figsize=(10, 6))
+ax = new_plot()
 bars = ax.bar(categories, values, color='skyblue', edgecolor='navy')
 ax.set_title('Bar Plot: Sample Categories')
 ax.set_xlabel('Category')
@@ -55,7 +66,7 @@ for bar in bars:
 save_figure(fig, 'bar_plot.png')
 
 # 4. Histogram
-fig, ax = plt.subplots(figsize=(10, 6))
+ax = new_plot()
 ax.hist(data, bins=30, edgecolor='black')
 ax.set_title('Histogram: Distribution of Random Data')
 ax.set_xlabel('Value')
@@ -63,14 +74,16 @@ ax.set_ylabel('Frequency')
 save_figure(fig, 'histogram.png')
 
 # 5. Box Plot
-fig, ax = plt.subplots(figsize=(10, 6))
+ax = new_plot()
 ax.boxplot([y1, y2], labels=['sin(x)', 'cos(x)'])
 ax.set_title('Box Plot: Distribution of sin(x) and cos(x)')
 ax.set_ylabel('Value')
 save_figure(fig, 'box_plot.png')
 
 # 6. Subplots
-fig, axs = plt.subplots(2, 2, figsize=(12, 10))
+fig.clf()
+fig.set_size_inches(12, 10)
+axs = fig.subplots(2, 2)
 fig.suptitle('Subplots: Multiple Visualizations', fontsize=16)
 
 axs[0, 0].plot(x, y1)
@@ -85,8 +98,9 @@ axs[1, 0].set_title('Bar Plot: Categories')
 axs[1, 1].hist(data, bins=20)
 axs[1, 1].set_title('Histogram: Random Data')
 
-plt.tight_layout()
+fig.tight_layout()
 save_figure(fig, 'subplots.png')
+plt.close(fig)
 
 print("\nMatplotlib Overview Complete!")
 print(f"I've created various types of plots and saved them in the '{image_dir}' directory.")
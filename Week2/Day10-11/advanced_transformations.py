@@ -2,6 +2,8 @@
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from datetime import datetime, timedelta
 import os
 
@@ -9,24 +11,34 @@ import os
 print("1. Creating sample gene expression dataset")
 
 # Set random seed for reproducibility
-np.random.seed(42)
+# default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+# than the legacy np.random functions and keeps its own seeded state
+rng = np.random.default_rng(42)
 
 # Generate synthetic gene expression data
 # In real experiments, gene expression is typically measured for multiple genes
 # across different samples/conditions using techniques like RNA-seq or microarrays
 n_genes = 100  # Number of genes to simulate
 n_samples = 20  # Number of experimental samples
-gene_names = [f'GENE_{i:03d}' for i in range(n_genes)]  # Generate gene identifiers
-sample_names = [f'SAMPLE_{i:02d}' for i in range(n_samples)]  # Generate sample identifiers
+# The identifiers are stored as categoricals: pandas keeps each distinct name once
+# and uses small integer codes everywhere else, so the merges and groupbys below
+# compare integers instead of hashing strings
+gene_names = pd.CategoricalIndex([f'GENE_{i:03d}' for i in range(n_genes)])  # Generate gene identifiers
+sample_names = pd.CategoricalIndex([f'SAMPLE_{i:02d}' for i in range(n_samples)])  # Generate sample identifiers
 
 # Generate random expression values
 # We use normal distribution with mean=5 and std=2 to simulate log2 expression values
 # Real gene expression data often follows a log-normal distribution
-expression_data = np.random.normal(loc=5, scale=2, size=(n_genes, n_samples))
+# float32 is precise enough for expression values and halves the memory that the
+# z-score, fold change and correlation calculations have to read
+expression_data = rng.standard_normal(size=(n_genes, n_samples), dtype=np.float32) * 2 + 5
 
 # Create the main dataframe
 # Rows represent genes, columns represent samples (standard format for expression data)
-df = pd.DataFrame(expression_data, index=gene_names, columns=sample_names)
+# np.asfortranarray() stores the matrix column by column, matching how pandas keeps
+# its columns, so per-sample operations read contiguous memory instead of jumping
+# across rows
+df = pd.DataFrame(np.asfortranarray(expression_data), index=gene_names, columns=sample_names)
 
 # Create sample metadata
 # In real experiments, each sample has associated metadata like treatment conditions,
@@ -34,11 +46,11 @@ df = pd.DataFrame(expression_data, index=gene_names, columns=sample_names)
 sample_metadata = pd.DataFrame({
     'sample_id': sample_names,
     # Samples are divided into control and treatment groups
-    'condition': np.random.choice(['Control', 'Treatment A', 'Treatment B'], n_samples),
+    'condition': rng.choice(['Control', 'Treatment A', 'Treatment B'], n_samples),
     # Time points represent when samples were collected after treatment
-    'time_point': np.random.choice(['0h', '12h', '24h', '48h'], n_samples),
+    'time_point': rng.choice(['0h', '12h', '24h', '48h'], n_samples),
     # Batch information is important for controlling technical variation
-    'batch': np.random.choice(['Batch1', 'Batch2'], n_samples)
+    'batch': rng.choice(['Batch1', 'Batch2'], n_samples)
 })
 
 print("\n2. Exploring data transformations")
@@ -53,6 +65,9 @@ melted_df = df.reset_index().melt(
     value_name='expression'  # Expression values become a column
 )
 melted_df = melted_df.rename(columns={'index': 'gene_id'})
+# melt() turns the column labels into plain strings, so we restore the sample categories
+# to keep the merge below on matching integer codes
+melted_df['sample_id'] = pd.Categorical(melted_df['sample_id'], categories=sample_names.categories)
 print(melted_df.head())
 
 # Merge with metadata
@@ -60,6 +75,12 @@ print(melted_df.head())
 # This links each expression measurement with its experimental conditions
 print("\nMerging with metadata")
 merged_df = melted_df.merge(sample_metadata, on='sample_id')
+# The label columns only hold a handful of distinct strings, repeated many times
+# Storing them as categories (like the gene and sample IDs already are) keeps one small
+# integer code per row, so grouping and pivoting on them works with integers instead
+# of hashing the same strings over and over
+for column in ['condition', 'time_point', 'batch']:
+    merged_df[column] = merged_df[column].astype('category')
 print(merged_df.head())
 
 print("\n3. Performing complex transformations")
@@ -67,16 +88,19 @@ print("\n3. Performing complex transformations")
 # Z-score normalization
 # This transforms expression values to standard deviations from the mean
 # Useful for comparing expression patterns across genes with different baseline levels
-def calculate_zscore(group):
-    """
-    Calculate z-scores for a group of values
-    Z-score = (value - mean) / standard deviation
-    This normalizes the data to have mean=0 and std=1
-    """
-    return (group - group.mean()) / group.std()
-
+# Z-score = (value - mean) / standard deviation
+# Instead of applying a Python function to each sample column, we compute the
+# column means and standard deviations on the whole NumPy array at once and let
+# broadcasting normalize every column in a single expression
 print("\nCalculating z-scores")
-zscore_df = df.apply(calculate_zscore)
+expression_values = df.to_numpy()
+column_means = expression_values.mean(axis=0)
+column_stds = expression_values.std(axis=0, ddof=1)  # ddof=1 matches pandas' std()
+zscore_df = pd.DataFrame(
+    (expression_values - column_means) / column_stds,
+    index=df.index,
+    columns=df.columns
+)
 print(zscore_df.head())
 
 # Create pivot table for condition and time analysis
@@ -88,7 +112,8 @@ pivot_df = pd.pivot_table(
     values='expression',
     index='gene_id',
     columns=['condition', 'time_point'],
-    aggfunc='mean'  # Calculate mean expression for each condition/time combination
+    aggfunc='mean',  # Calculate mean expression for each condition/time combination
+    observed=True  # Only keep category combinations that actually occur in the data
 )
 print(pivot_df.head())
 
@@ -101,28 +126,23 @@ def calculate_fold_changes(df, control_condition='Control'):
     - log2(FC) > 0 indicates upregulation
     - log2(FC) < 0 indicates downregulation
     """
-    # Get control samples
-    control_samples = sample_metadata[
-        sample_metadata['condition'] == control_condition
-    ]['sample_id']
+    # Look up the condition of every sample column
+    sample_conditions = sample_metadata.set_index('sample_id').loc[df.columns, 'condition']
     
-    # Calculate mean expression for control condition
-    control_mean = df[control_samples].mean(axis=1)
+    # Calculate mean expression for every condition in a single groupby
+    # (genes x conditions), instead of slicing the samples of each condition separately
+    condition_means = df.T.groupby(sample_conditions, sort=False).mean().T
+    control_mean = condition_means[control_condition]
     
-    # Calculate fold changes for each treatment condition
-    fold_changes = pd.DataFrame(index=df.index)
-    for condition in sample_metadata['condition'].unique():
-        if condition != control_condition:
-            # Get samples for this condition
-            condition_samples = sample_metadata[
-                sample_metadata['condition'] == condition
-            ]['sample_id']
-            # Calculate mean expression for treatment
-            condition_mean = df[condition_samples].mean(axis=1)
-            # Calculate log2 fold change
-            fold_changes[f'FC_{condition}'] = np.log2(condition_mean / control_mean)
+    # Calculate log2 fold change of each treatment condition against the control
+    # The ratios are computed into one array and log2 overwrites them in place
+    # (out=), so no second temporary array is allocated for the result
+    treatment_means = condition_means.drop(columns=control_condition)
+    log2_ratios = treatment_means.to_numpy() / control_mean.to_numpy()[:, np.newaxis]
+    np.log2(log2_ratios, out=log2_ratios)
+    fold_changes = pd.DataFrame(log2_ratios, index=df.index, columns=treatment_means.columns)
     
-    return fold_changes
+    return fold_changes.add_prefix('FC_').rename_axis(columns=None)
 
 fold_changes = calculate_fold_changes(df)
 print(fold_changes.head())
@@ -135,14 +155,15 @@ def find_significant_genes(fold_changes, threshold=1.5):
     threshold: minimum absolute log2 fold change to be considered significant
     Returns dictionary with lists of significant genes for each condition
     """
-    significant_genes = {}
-    for column in fold_changes.columns:
-        # Get genes with absolute fold change above threshold
-        sig_genes = fold_changes[
-            abs(fold_changes[column]) > threshold
-        ].index.tolist()
-        significant_genes[column] = sig_genes
-    return significant_genes
+    # Compare every absolute fold change against the threshold in one go
+    # This gives a genes x conditions boolean mask
+    significant_mask = np.abs(fold_changes.to_numpy()) > threshold
+    gene_ids = fold_changes.index.to_numpy()
+    # Each column of the mask selects the significant genes for that condition
+    return {
+        column: gene_ids[significant_mask[:, i]].tolist()
+        for i, column in enumerate(fold_changes.columns)
+    }
 
 significant_genes = find_significant_genes(fold_changes)
 print("\nNumber of significant genes per condition:")
@@ -158,23 +179,19 @@ def simple_batch_correction(df, batch_info):
     biological variation of interest
     
     """
-    # Calculate mean expression for each batch
-    batch_means = {}
-    corrected_df = df.copy()
+    # Look up the batch of every sample column
+    sample_batches = batch_info.set_index('sample_id').loc[df.columns, 'batch']
     
     # Calculate mean expression level for each batch
-    for batch in batch_info['batch'].unique():
-        batch_samples = batch_info[batch_info['batch'] == batch]['sample_id']
-        batch_means[batch] = df[batch_samples].mean().mean()
+    # (the average of its samples' mean expression, all batches in one groupby)
+    batch_means = df.mean().groupby(sample_batches).mean()
     
     # Center each batch by adjusting to global mean
-    global_mean = np.mean(list(batch_means.values()))
-    for batch in batch_means:
-        batch_samples = batch_info[batch_info['batch'] == batch]['sample_id']
-        correction_factor = global_mean - batch_means[batch]
-        corrected_df[batch_samples] += correction_factor
+    # Every sample column gets its batch's correction factor added in one broadcast
+    global_mean = batch_means.mean()
+    correction_factors = global_mean - sample_batches.map(batch_means)
     
-    return corrected_df
+    return df.add(correction_factors, axis='columns')
 
 corrected_df = simple_batch_correction(df, sample_metadata)
 print("\nBatch correction complete")
@@ -187,15 +204,26 @@ results_dir = 'analysis_results'
 os.makedirs(results_dir, exist_ok=True)
 
 # Save the processed data for further analysis
-fold_changes.to_csv(os.path.join(results_dir, 'fold_changes.csv'))
+# PyArrow's CSV writer converts whole columns at a time, which is much faster than
+# pandas' to_csv() for large numeric tables
+pa_csv.write_csv(
+    pa.Table.from_pandas(fold_changes.rename_axis('gene_id').reset_index()),
+    os.path.join(results_dir, 'fold_changes.csv')
+)
+# The pivot table has two levels of column headers (condition, time point),
+# which a flat Arrow table can't represent, so it stays on pandas' writer
 pivot_df.to_csv(os.path.join(results_dir, 'expression_by_condition.csv'))
 
 # Save list of significant genes
-with open(os.path.join(results_dir, 'significant_genes.txt'), 'w') as f:
-    for condition, genes in significant_genes.items():
-        f.write(f"\n{condition}:\n")
-        f.write('\n'.join(genes))
-        f.write('\n')
+# I build the whole text first and write it in one go,
+# instead of three small writes per condition
+parts = []
+for condition, genes in significant_genes.items():
+    parts.append(f"\n{condition}:\n")
+    parts.append('\n'.join(genes))
+    parts.append('\n')
+with open(os.path.join(results_dir, 'significant_genes.txt'), 'w', buffering=1 << 20) as f:
+    f.write(''.join(parts))
 
 print("\nAnalysis complete! Results saved in 'analysis_results' directory.")
 
@@ -5,6 +5,11 @@
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import matplotlib
+# Plots are only saved to files, so the Agg backend avoids setting up a GUI toolkit
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import os
 
@@ -15,72 +20,95 @@ os.makedirs(visualization_path, exist_ok=True)
 print("1. Creating sample datasets")
 
 # Set random seed for reproducibility
-np.random.seed(42)
+# default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+# than the legacy np.random functions and keeps its own seeded state
+rng = np.random.default_rng(42)
+
+# All three datasets describe the same patients, so the patient IDs are built once
+# and shared. Because every table uses this same Categorical, their patient_id
+# codes line up exactly and joining them is a simple integer match
+PATIENT_IDS = pd.Categorical([f'PT_{i:03d}' for i in range(100)])
 
 # Generate gene expression data
 # In real scenarios, this might come from RNA-seq or microarray experiments
-def create_expression_data(n_patients=100, n_genes=50):
+def create_expression_data(patient_ids=PATIENT_IDS, n_genes=50):
     """
     Create synthetic gene expression data
     Parameters:
-        n_patients: number of patients
+        patient_ids: Categorical of patient IDs
         n_genes: number of genes measured
     Returns:
         DataFrame with gene expression values
     """
-    patient_ids = [f'PT_{i:03d}' for i in range(n_patients)]
-    gene_ids = [f'GENE_{i:03d}' for i in range(n_genes)]
+    n_patients = len(patient_ids)
+    # IDs are stored as categoricals (integer codes + one copy of each name),
+    # so merging and grouping on them doesn't need to hash strings
+    gene_ids = pd.CategoricalIndex([f'GENE_{i:03d}' for i in range(n_genes)])
     
     # Generate random expression values (log2 scale)
-    data = np.random.normal(loc=6, scale=2, size=(n_patients, n_genes))
+    # float32 halves the memory compared to the default float64
+    data = rng.standard_normal(size=(n_patients, n_genes), dtype=np.float32) * 2 + 6
     
-    return pd.DataFrame(data, index=patient_ids, columns=gene_ids)
+    # Column-major (Fortran) order keeps each gene column contiguous in the DataFrame
+    return pd.DataFrame(
+        np.asfortranarray(data),
+        index=pd.CategoricalIndex(patient_ids),
+        columns=gene_ids
+    )
 
 # Generate protein measurement data
 # This could represent mass spectrometry or Western blot data
-def create_protein_data(n_patients=100, n_proteins=30):
+def create_protein_data(patient_ids=PATIENT_IDS, n_proteins=30):
     """
     Create synthetic protein measurement data
     Parameters:
-        n_patients: number of patients
+        patient_ids: Categorical of patient IDs
         n_proteins: number of proteins measured
     Returns:
         DataFrame with protein levels
     """
-    data = []
-    for pt_idx in range(n_patients):
-        patient_id = f'PT_{pt_idx:03d}'
-        for prot_idx in range(n_proteins):
-            protein_id = f'PROT_{prot_idx:03d}'
-            # Protein measurements often have some missing values
-            if np.random.random() > 0.1:  # 10% missing data
-                level = np.random.normal(100, 20)
-                data.append({
-                    'patient_id': patient_id,
-                    'protein_id': protein_id,
-                    'protein_level': level,
-                    'detection_quality': 'High' if level > 80 else 'Low'
-                })
+    n_patients = len(patient_ids)
+    protein_ids = pd.Categorical([f'PROT_{i:03d}' for i in range(n_proteins)])
+    
+    # Draw every patient x protein measurement at once instead of one at a time
+    levels = rng.normal(100, 20, size=(n_patients, n_proteins))
+    # Protein measurements often have some missing values
+    detected = rng.random(size=(n_patients, n_proteins)) > 0.1  # 10% missing data
+    
+    # Flatten the grid row by row (patient by patient) and keep only the detected
+    # measurements, the same rows the nested loops used to append one by one
+    detected_flat = detected.ravel()
+    level_values = levels.ravel()[detected_flat]
     
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'patient_id': patient_ids.repeat(n_proteins)[detected_flat],
+        'protein_id': pd.Categorical.from_codes(
+            np.tile(protein_ids.codes, n_patients)[detected_flat],
+            categories=protein_ids.categories
+        ),
+        'protein_level': level_values,
+        'detection_quality': np.where(level_values > 80, 'High', 'Low')
+    })
 
 # Generate clinical data
 # This represents patient metadata and clinical outcomes
-def create_clinical_data(n_patients=100):
+def create_clinical_data(patient_ids=PATIENT_IDS):
     """
     Create synthetic clinical data
+    Parameters:
+        patient_ids: Categorical of patient IDs
     Returns:
         DataFrame with patient clinical information
     """
-    patient_ids = [f'PT_{i:03d}' for i in range(n_patients)]
+    n_patients = len(patient_ids)
     
     return pd.DataFrame({
         'patient_id': patient_ids,
-        'age': np.random.normal(60, 10, n_patients).astype(int),
-        'sex': np.random.choice(['M', 'F'], n_patients),
-        'disease_stage': np.random.choice(['I', 'II', 'III', 'IV'], n_patients),
-        'treatment_response': np.random.choice(['Complete', 'Partial', 'None'], n_patients),
-        'survival_months': np.random.exponential(24, n_patients).astype(int)
+        'age': rng.normal(60, 10, n_patients).astype(int),
+        'sex': rng.choice(['M', 'F'], n_patients),
+        'disease_stage': rng.choice(['I', 'II', 'III', 'IV'], n_patients),
+        'treatment_response': rng.choice(['Complete', 'Partial', 'None'], n_patients),
+        'survival_months': rng.exponential(24, n_patients).astype(int)
     })
 
 # Create our sample datasets
@@ -98,20 +126,34 @@ print("\n2. Basic merging operations")
 
 # Reshape expression data for merging
 # Convert from wide to long format
-expr_long = expression_df.reset_index().melt(
-    id_vars=['index'],
-    var_name='gene_id',
-    value_name='expression_level'
-).rename(columns={'index': 'patient_id'})
+# Flattening the patients x genes matrix row by row gives the long format directly:
+# each patient ID is repeated once per gene, and the gene IDs cycle for every patient
+n_patients, n_genes = expression_df.shape
+# (repeating/tiling the category codes keeps both ID columns categorical)
+expr_long = pd.DataFrame({
+    'patient_id': expression_df.index.repeat(n_genes),
+    'gene_id': pd.Categorical.from_codes(
+        np.tile(expression_df.columns.codes, n_patients),
+        categories=expression_df.columns.categories
+    ),
+    'expression_level': expression_df.to_numpy().ravel()
+})
 
 print("\nMerging clinical data with expression data")
 # Merge clinical data with gene expression data
 # This links patient outcomes with their gene expression profiles
-clinical_expr = clinical_df.merge(
-    expr_long,
-    on='patient_id',
-    how='inner'  # Only keep patients with both clinical and expression data
+# We only need to look up each patient's clinical row once (n_patients lookups
+# instead of hashing the key of every long-format row), then repeat that
+# position for all of the patient's genes and take the rows by position
+patient_rows = np.repeat(
+    pd.Index(clinical_df['patient_id']).get_indexer(expression_df.index),
+    n_genes
 )
+has_clinical = patient_rows >= 0  # Only keep patients with both clinical and expression data
+clinical_expr = pd.concat([
+    clinical_df.iloc[patient_rows[has_clinical]].reset_index(drop=True),
+    expr_long.loc[has_clinical, ['gene_id', 'expression_level']].reset_index(drop=True)
+], axis=1)
 print("Shape after merge:", clinical_expr.shape)
 
 print("\n3. Advanced merging operations")
@@ -130,26 +172,18 @@ def create_integrated_dataset():
     Create an integrated dataset combining all data sources
     Uses multiple merge operations and handles missing data
     """
-    # Start with clinical data
-    integrated = clinical_df.copy()
-    
-    # Add mean expression levels per patient
-    patient_expr_means = expression_df.mean(axis=1).reset_index()
-    patient_expr_means.columns = ['patient_id', 'mean_expression']
-    integrated = integrated.merge(
-        patient_expr_means,
-        on='patient_id',
-        how='left'
-    )
+    # Mean expression levels per patient, indexed by patient ID
+    patient_expr_means = expression_df.mean(axis=1).rename('mean_expression')
     
-    # Add protein data
-    integrated = integrated.merge(
-        protein_pivot,
-        on='patient_id',
+    # Start with clinical data indexed by patient ID, then add the mean expression
+    # and the protein data in one join: all three tables are aligned on their
+    # patient index at once, without intermediate copies for each merge
+    integrated = clinical_df.set_index('patient_id').join(
+        [patient_expr_means, protein_pivot],
         how='left'
     )
     
-    return integrated
+    return integrated.reset_index()
 
 integrated_df = create_integrated_dataset()
 print("\nIntegrated dataset shape:", integrated_df.shape)
@@ -161,9 +195,22 @@ def analyze_missing_data(df):
     """
     Analyze patterns of missing data across the integrated dataset
     """
+    # Most columns are numeric: np.isnan() on their raw float array counts the
+    # missing values of all of them in one vectorized pass
+    numeric_df = df.select_dtypes(include=[np.number])
+    numeric_missing = np.isnan(numeric_df.to_numpy(dtype=np.float64)).sum(axis=0)
+    # The few remaining (text/categorical) columns go through pandas' isnull()
+    other_missing = df.select_dtypes(exclude=[np.number]).isnull().sum()
+    
+    # Count once, put the columns back in their original order
+    missing_count = pd.concat([
+        pd.Series(numeric_missing, index=numeric_df.columns),
+        other_missing
+    ]).reindex(df.columns)
+    
     missing_summary = pd.DataFrame({
-        'missing_count': df.isnull().sum(),
-        'missing_percent': (df.isnull().sum() / len(df) * 100).round(2)
+        'missing_count': missing_count,
+        'missing_percent': (missing_count / len(df) * 100).round(2)
     }).sort_values('missing_percent', ascending=False)
     
     return missing_summary
@@ -173,18 +220,19 @@ print("\nMissing data analysis:")
 print(missing_analysis[missing_analysis['missing_count'] > 0])
 
 # Visualize missing data patterns
-plt.figure(figsize=(10, 6))
-plt.bar(
+# Both plots in this script are drawn on this one figure, cleared in between
+fig = plt.figure(figsize=(10, 6))
+ax = fig.add_subplot()
+ax.bar(
     range(len(missing_analysis)),
     missing_analysis['missing_percent'],
     alpha=0.5
 )
-plt.title('Missing Data by Column')
-plt.xlabel('Column Index')
-plt.ylabel('Percent Missing')
-plt.tight_layout()
-plt.savefig(os.path.join(visualization_path, 'missing_data_patterns.png'))
-plt.close()
+ax.set_title('Missing Data by Column')
+ax.set_xlabel('Column Index')
+ax.set_ylabel('Percent Missing')
+fig.tight_layout()
+fig.savefig(os.path.join(visualization_path, 'missing_data_patterns.png'))
 
 print("\n5. Creating analysis-ready datasets")
 
@@ -203,15 +251,21 @@ def prepare_analysis_dataset(integrated_df, missing_threshold=50):
     analysis_df = integrated_df[columns_to_keep].copy()
     
     # Fill missing values appropriately
+    # Each group of columns is filled with one fillna() call that takes a value per column,
+    # instead of calling fillna(inplace=True) column by column on a copy
     # Numeric columns: fill with median
     numeric_columns = analysis_df.select_dtypes(include=[np.number]).columns
-    for col in numeric_columns:
-        analysis_df[col].fillna(analysis_df[col].median(), inplace=True)
+    analysis_df[numeric_columns] = analysis_df[numeric_columns].fillna(
+        analysis_df[numeric_columns].median()
+    )
     
     # Categorical columns: fill with mode
+    # (mode() of no columns has no row to take, so only fill when there are some)
     categorical_columns = analysis_df.select_dtypes(include=['object']).columns
-    for col in categorical_columns:
-        analysis_df[col].fillna(analysis_df[col].mode()[0], inplace=True)
+    if len(categorical_columns):
+        analysis_df[categorical_columns] = analysis_df[categorical_columns].fillna(
+            analysis_df[categorical_columns].mode().iloc[0]
+        )
     
     return analysis_df
 
@@ -222,25 +276,31 @@ print("\nAnalysis-ready dataset shape:", analysis_ready_df.shape)
 print("\n6. Creating summary visualizations")
 
 # Create visualization of data relationships
-def plot_data_relationships(df):
+def plot_data_relationships(df, fig):
     """
     Create visualization showing relationships between different data types
+    Draws on the given figure, clearing whatever was plotted on it before
     """
     # Select numeric columns for correlation analysis
     numeric_cols = df.select_dtypes(include=[np.number]).columns
-    correlations = df[numeric_cols].corr()
+    # Missing values have already been filled, so np.corrcoef can compute every
+    # pairwise correlation with a single matrix product (float32 is plenty for a plot)
+    numeric_values = df[numeric_cols].to_numpy(dtype=np.float32)
+    correlations = np.corrcoef(numeric_values, rowvar=False)
     
-    plt.figure(figsize=(12, 8))
-    plt.imshow(correlations, cmap='coolwarm', aspect='auto')
-    plt.colorbar(label='Correlation')
-    plt.xticks(range(len(numeric_cols)), numeric_cols, rotation=45, ha='right')
-    plt.yticks(range(len(numeric_cols)), numeric_cols)
-    plt.title('Correlations Across Integrated Dataset')
-    plt.tight_layout()
-    plt.savefig(os.path.join(visualization_path, 'data_correlations.png'))
-    plt.close()
-
-plot_data_relationships(analysis_ready_df)
+    fig.clf()
+    fig.set_size_inches(12, 8)
+    ax = fig.add_subplot()
+    image = ax.imshow(correlations, cmap='coolwarm', aspect='auto')
+    fig.colorbar(image, label='Correlation')
+    ax.set_xticks(range(len(numeric_cols)), numeric_cols, rotation=45, ha='right')
+    ax.set_yticks(range(len(numeric_cols)), numeric_cols)
+    ax.set_title('Correlations Across Integrated Dataset')
+    fig.tight_layout()
+    fig.savefig(os.path.join(visualization_path, 'data_correlations.png'))
+
+plot_data_relationships(analysis_ready_df, fig)
+plt.close(fig)
 
 print("\n7. Exporting results")
 
@@ -249,8 +309,15 @@ results_dir = 'merged_results'
 os.makedirs(results_dir, exist_ok=True)
 
 # Save various versions of the data
-analysis_ready_df.to_csv(os.path.join(results_dir, 'analysis_ready_data.csv'))
-missing_analysis.to_csv(os.path.join(results_dir, 'missing_data_analysis.csv'))
+# PyArrow's CSV writer converts whole columns at a time instead of formatting row by row
+pa_csv.write_csv(
+    pa.Table.from_pandas(analysis_ready_df, preserve_index=False),
+    os.path.join(results_dir, 'analysis_ready_data.csv')
+)
+pa_csv.write_csv(
+    pa.Table.from_pandas(missing_analysis.rename_axis('column').reset_index()),
+    os.path.join(results_dir, 'missing_data_analysis.csv')
+)
 
 # Create a data summary report
 with open(os.path.join(results_dir, 'data_summary.txt'), 'w') as f:
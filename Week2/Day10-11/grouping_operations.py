@@ -14,7 +14,9 @@ os.makedirs(visualization_path, exist_ok=True)
 print("1. Creating sample biological experiment data")
 
 # Set random seed for reproducibility
-np.random.seed(42)
+# default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+# than the legacy np.random functions and keeps its own seeded state
+rng = np.random.default_rng(42)
 
 # Generate synthetic experimental data that mimics a large-scale biological study
 # This could represent, for example, a flow cytometry experiment measuring
@@ -25,31 +27,42 @@ n_experiments = 1000  # Number of individual experiments/measurements
 data = {
     'experiment_id': [f'EXP_{i:04d}' for i in range(n_experiments)],
     # Protein levels typically follow a normal distribution in log-space
-    'protein_level': np.random.normal(100, 15, n_experiments),
+    'protein_level': rng.normal(100, 15, n_experiments),
     # Gene expression values also typically follow a normal distribution
-    'gene_expression': np.random.normal(50, 10, n_experiments),
+    'gene_expression': rng.normal(50, 10, n_experiments),
     # Different cell types being studied
-    'cell_type': np.random.choice(['T-cell', 'B-cell', 'NK-cell'], n_experiments),
+    'cell_type': rng.choice(['T-cell', 'B-cell', 'NK-cell'], n_experiments),
     # Different treatment conditions
-    'treatment': np.random.choice(['Control', 'Drug A', 'Drug B', 'Drug C'], n_experiments),
+    'treatment': rng.choice(['Control', 'Drug A', 'Drug B', 'Drug C'], n_experiments),
     # Time points for temporal analysis
-    'time_point': np.random.choice(['0h', '6h', '12h', '24h'], n_experiments),
+    'time_point': rng.choice(['0h', '6h', '12h', '24h'], n_experiments),
     # Experimental batches to account for technical variation
-    'batch': np.random.choice(['Batch1', 'Batch2', 'Batch3'], n_experiments),
+    'batch': rng.choice(['Batch1', 'Batch2', 'Batch3'], n_experiments),
     # Temperature during experiment (should be close to 37°C)
-    'temperature': np.random.normal(37, 0.5, n_experiments),
+    'temperature': rng.normal(37, 0.5, n_experiments),
     # Binary success indicator for quality control
-    'success': np.random.choice([True, False], n_experiments, p=[0.9, 0.1])
+    'success': rng.choice([True, False], n_experiments, p=[0.9, 0.1])
 }
 
 # Create DataFrame from our synthetic data
 df = pd.DataFrame(data)
 
+# The condition columns only take a handful of values and are grouped on again and
+# again below, so I store them as categoricals: each row keeps a small integer code
+# and groupby works on those codes instead of hashing the strings every time
+for column in ['cell_type', 'treatment', 'time_point', 'batch']:
+    df[column] = df[column].astype('category')
+
 print("\n2. Basic grouping operations")
 
+# I group by the same keys again and again in this script, so I build the two
+# groupby objects once and reuse them: the group labels are only worked out once
+cell_type_groups = df.groupby('cell_type', observed=True)
+condition_groups = df.groupby(['cell_type', 'treatment'], observed=True)
+
 # Perform simple groupby operations with multiple aggregation functions
 # This gives us an overview of how measurements vary across cell types
-basic_stats = df.groupby('cell_type').agg({
+basic_stats = cell_type_groups.agg({
     'protein_level': ['count', 'mean', 'std'],  # Basic statistics for protein levels
     'gene_expression': ['mean', 'std']          # Basic statistics for gene expression
 })
@@ -58,27 +71,36 @@ print(basic_stats)
 
 print("\n3. Advanced grouping operations")
 
-# Define custom aggregation function for more specific analysis
-def quartile_range(x):
-    """Calculate the interquartile range (IQR)
-    IQR is a robust measure of variability, less sensitive to outliers than std"""
-    return x.quantile(0.75) - x.quantile(0.25)
-
 # Perform complex grouping with multiple keys and custom aggregations
-advanced_stats = df.groupby(['cell_type', 'treatment']).agg({
-    'protein_level': [
-        'count',                                # Number of measurements
-        'mean',                                 # Average protein level
-        'std',                                  # Standard deviation
-        quartile_range,                         # Custom IQR function
-        lambda x: x.quantile(0.95)              # 95th percentile
-    ],
-    'gene_expression': [
-        'mean',
-        'std',
-        quartile_range
-    ]
-}).round(2)
+advanced_stats = condition_groups.agg({
+    'protein_level': ['count', 'mean', 'std'],  # Number of measurements, average, spread
+    'gene_expression': ['mean', 'std']
+})
+
+# The quantile-based statistics come from one built-in grouped quantile call
+# instead of Python functions that pandas would have to call group by group
+quantiles = condition_groups[['protein_level', 'gene_expression']].quantile(
+    [0.25, 0.75, 0.95]
+).unstack()
+for column in ['protein_level', 'gene_expression']:
+    # Interquartile range (IQR): a robust measure of variability,
+    # less sensitive to outliers than std
+    advanced_stats[(column, 'quartile_range')] = (
+        quantiles[(column, 0.75)] - quantiles[(column, 0.25)]
+    )
+# 95th percentile (keeps the column name the original lambda produced)
+advanced_stats[('protein_level', '<lambda_0>')] = quantiles[('protein_level', 0.95)]
+
+advanced_stats = advanced_stats[[
+    ('protein_level', 'count'),
+    ('protein_level', 'mean'),
+    ('protein_level', 'std'),
+    ('protein_level', 'quartile_range'),
+    ('protein_level', '<lambda_0>'),
+    ('gene_expression', 'mean'),
+    ('gene_expression', 'std'),
+    ('gene_expression', 'quartile_range')
+]].round(2)
 
 print("\nAdvanced statistics by cell type and treatment:")
 print(advanced_stats)
@@ -87,13 +109,13 @@ print("\n4. Transform and filter operations")
 
 # Calculate z-scores within each cell type group
 # This normalizes measurements relative to other cells of the same type
-df['protein_z_score'] = df.groupby('cell_type')['protein_level'].transform(
+df['protein_z_score'] = cell_type_groups['protein_level'].transform(
     lambda x: (x - x.mean()) / x.std()
 )
 
 # Filter groups based on size and variability criteria
 # This helps focus on groups with sufficient data and interesting variation
-significant_groups = df.groupby(['cell_type', 'treatment']).filter(
+significant_groups = condition_groups.filter(
     lambda x: (len(x) >= 20) &                  # At least 20 measurements
              (x['protein_level'].std() > 10)     # Substantial variation
 )
@@ -103,14 +125,47 @@ print("\nNumber of significant groups:", len(significant_groups['cell_type'].uni
 print("\n5. Window operations")
 
 # Sort values for meaningful window calculations
-df_sorted = df.sort_values('protein_level')
+# Sorting by cell type first puts every group in one contiguous block,
+# still ordered by protein level inside the block
+df_sorted = df.sort_values(['cell_type', 'protein_level'])
 
 # Calculate rolling statistics within groups
 # This helps identify trends and patterns in sorted data
-rolling_stats = df_sorted.groupby('cell_type')['protein_level'].rolling(
-    window=20,      # Calculate over windows of 20 measurements
-    min_periods=5   # Require at least 5 measurements for calculation
-).agg(['mean', 'std'])
+window = 20       # Calculate over windows of 20 measurements
+min_periods = 5   # Require at least 5 measurements for calculation
+
+# Instead of groupby().rolling(), every window sum is the difference of two
+# cumulative sums, so all groups are handled in one pass over the array
+codes = df_sorted['cell_type'].cat.codes.to_numpy()
+values = df_sorted['protein_level'].to_numpy()
+n_rows = len(values)
+
+# Centering on the group mean keeps the running sums of squares accurate
+group_means = np.bincount(codes, weights=values) / np.bincount(codes)
+x = values - group_means[codes]
+cumsum = np.concatenate(([0.0], np.cumsum(x)))
+cumsum_sq = np.concatenate(([0.0], np.cumsum(x * x)))
+
+# Each window starts `window` rows back, but never before the start of its group
+group_start = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+row_group_start = np.repeat(group_start, np.diff(np.r_[group_start, n_rows]))
+end = np.arange(1, n_rows + 1)
+start = np.maximum(end - window, row_group_start)
+count = end - start
+
+window_sum = cumsum[end] - cumsum[start]
+window_sum_sq = cumsum_sq[end] - cumsum_sq[start]
+with np.errstate(invalid='ignore', divide='ignore'):
+    rolling_mean = window_sum / count
+    rolling_std = np.sqrt(np.maximum(window_sum_sq - window_sum * rolling_mean, 0) / (count - 1))
+too_short = count < min_periods
+rolling_mean[too_short] = np.nan
+rolling_std[too_short] = np.nan
+
+rolling_stats = pd.DataFrame(
+    {'mean': rolling_mean + group_means[codes], 'std': rolling_std},
+    index=pd.MultiIndex.from_arrays([df_sorted['cell_type'], df_sorted.index])
+)
 
 print("\nRolling statistics example:")
 print(rolling_stats.head())
@@ -119,7 +174,7 @@ print("\n6. Complex transformations")
 
 # Calculate experiment success rates by group
 # This helps identify conditions that might be problematic
-success_rate = df.groupby(['cell_type', 'treatment'])['success'].agg([
+success_rate = condition_groups['success'].agg([
     'count',                                    # Total number of experiments
     ('success_rate', 'mean')                    # Proportion of successful experiments
 ]).round(3) * 100  # Convert to percentage
@@ -129,11 +184,9 @@ print(success_rate)
 
 # Visualize success rates across different conditions
 plt.figure(figsize=(12, 6))
-success_pivot = success_rate.reset_index().pivot(
-    index='cell_type',
-    columns='treatment',
-    values='success_rate'
-)
+# success_rate is already indexed by (cell_type, treatment), so unstacking the
+# treatment level gives the cell type x treatment table directly
+success_pivot = success_rate['success_rate'].unstack('treatment')
 success_pivot.plot(kind='bar')
 plt.title('Experiment Success Rate by Cell Type and Treatment')
 plt.xlabel('Cell Type')
@@ -147,24 +200,54 @@ print("\n7. Advanced analysis")
 
 # Create cross-tabulation of categorical variables
 # This shows how experiments are distributed across conditions
-cross_tab = pd.crosstab(
-    [df['cell_type'], df['treatment']],
-    df['time_point'],
-    margins=True  # Add row and column totals
+# The three columns are categoricals, so every (cell type, treatment, time point)
+# combination maps to one integer and a single np.bincount counts them all
+cell_types = df['cell_type'].cat.categories
+treatments = df['treatment'].cat.categories
+time_points = df['time_point'].cat.categories
+combination = (
+    (df['cell_type'].cat.codes.to_numpy() * len(treatments)
+     + df['treatment'].cat.codes.to_numpy()) * len(time_points)
+    + df['time_point'].cat.codes.to_numpy()
+)
+counts = np.bincount(
+    combination, minlength=len(cell_types) * len(treatments) * len(time_points)
+).reshape(len(cell_types) * len(treatments), len(time_points))
+
+# Add row and column totals
+counts = np.vstack([counts, counts.sum(axis=0)])
+counts = np.hstack([counts, counts.sum(axis=1, keepdims=True)])
+cross_tab = pd.DataFrame(
+    counts,
+    index=pd.MultiIndex.from_tuples(
+        [*pd.MultiIndex.from_product([cell_types, treatments]), ('All', '')],
+        names=['cell_type', 'treatment']
+    ),
+    columns=pd.Index([*time_points, 'All'], name='time_point')
 )
 print("\nCross-tabulation of experiments:")
 print(cross_tab)
 
 # Perform correlation analysis within groups
-def group_correlations(group):
-    """Calculate correlations between different measurements within each group"""
-    return pd.Series({
-        'protein_gene_corr': group['protein_level'].corr(group['gene_expression']),
-        'protein_temp_corr': group['protein_level'].corr(group['temperature'])
-    })
+# Instead of calling Series.corr twice for every group, I center each measurement
+# on its group mean and get Pearson's r for all groups at once from grouped sums:
+# r = sum(dx*dy) / sqrt(sum(dx^2) * sum(dy^2))
+group_keys = [df['cell_type'], df['treatment']]
+measurement_columns = ['protein_level', 'gene_expression', 'temperature']
+centered = df[measurement_columns] - condition_groups[measurement_columns].transform('mean')
+sums = pd.DataFrame({
+    'pg': centered['protein_level'] * centered['gene_expression'],
+    'pt': centered['protein_level'] * centered['temperature'],
+    'pp': centered['protein_level'] ** 2,
+    'gg': centered['gene_expression'] ** 2,
+    'tt': centered['temperature'] ** 2
+}).groupby(group_keys, observed=True).sum()
 
 # Calculate correlations for each combination of cell type and treatment
-correlations = df.groupby(['cell_type', 'treatment']).apply(group_correlations)
+correlations = pd.DataFrame({
+    'protein_gene_corr': sums['pg'] / np.sqrt(sums['pp'] * sums['gg']),
+    'protein_temp_corr': sums['pt'] / np.sqrt(sums['pp'] * sums['tt'])
+})
 print("\nCorrelation analysis by group:")
 print(correlations)
 
@@ -6,7 +6,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
 
 # Set up the visualization directory in the root folder
@@ -17,12 +17,15 @@ os.makedirs(visualization_path, exist_ok=True)
 print("1. Creating sample patient monitoring data")
 
 # Set random seed for reproducibility
-np.random.seed(42)
+# default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+# than the legacy np.random functions and keeps its own seeded state
+rng = np.random.default_rng(42)
 
 # Generate a sequence of dates for our time series
 # We'll create hourly measurements over 30 days
 start_date = datetime(2023, 1, 1)
-dates = [start_date + timedelta(hours=i) for i in range(24*30)]  # 30 days of hourly data
+dates = pd.date_range(start_date, periods=24*30, freq='h')  # 30 days of hourly data
+n_dates = len(dates)
 
 # Create sample patient IDs
 n_patients = 5
@@ -33,46 +36,58 @@ patients = [f'P{i:03d}' for i in range(n_patients)]
 # - Body temperature (normally around 37°C)
 # - Heart rate (normally around 75 bpm)
 # - Blood pressure (normally around 120 mmHg systolic)
-vital_signs_data = []
-for patient in patients:
-    # Generate baseline values for each patient
-    # Each patient has their own "normal" values that fluctuate around a personal baseline
-    baseline_temp = np.random.normal(37.0, 0.2)  # Normal body temperature with slight variation
-    baseline_hr = np.random.normal(75, 5)        # Normal heart rate with variation
-    baseline_bp = np.random.normal(120, 5)       # Normal blood pressure with variation
-    
-    for date in dates:
-        # Add circadian rhythm (daily cycle) and random variation
-        # Most vital signs follow a daily pattern influenced by sleep/wake cycles
-        hour = date.hour
-        daily_cycle = np.sin(2 * np.pi * hour / 24)  # Creates a sinusoidal pattern over 24 hours
-        
-        # Generate measurements with daily cycles and random noise
-        temp = baseline_temp + 0.1 * daily_cycle + np.random.normal(0, 0.1)
-        hr = baseline_hr + 5 * daily_cycle + np.random.normal(0, 2)
-        bp = baseline_bp + 3 * daily_cycle + np.random.normal(0, 2)
-        
-        # Record the measurements
-        vital_signs_data.append({
-            'timestamp': date,
-            'patient_id': patient,
-            'temperature': temp,
-            'heart_rate': hr,
-            'blood_pressure': bp,
-            # Most measurements are routine, some are emergency checks
-            'measurement_type': np.random.choice(['routine', 'emergency'], p=[0.9, 0.1])
-        })
+# Every measurement is generated at once as a (patient x hour) array instead of
+# one dict per row, NumPy broadcasting does the per-patient/per-hour combination
+
+# Generate baseline values for each patient
+# Each patient has their own "normal" values that fluctuate around a personal baseline
+# (column vectors, so they broadcast across all the hours of that patient)
+baseline_temp = rng.normal(37.0, 0.2, n_patients)[:, None]  # Normal body temperature with slight variation
+baseline_hr = rng.normal(75, 5, n_patients)[:, None]        # Normal heart rate with variation
+baseline_bp = rng.normal(120, 5, n_patients)[:, None]       # Normal blood pressure with variation
+
+# Add circadian rhythm (daily cycle) and random variation
+# Most vital signs follow a daily pattern influenced by sleep/wake cycles
+daily_cycle = np.sin(2 * np.pi * dates.hour.to_numpy() / 24)  # Creates a sinusoidal pattern over 24 hours
+
+# Generate measurements with daily cycles and random noise
+shape = (n_patients, n_dates)
+temp = baseline_temp + 0.1 * daily_cycle + rng.normal(0, 0.1, shape)
+hr = baseline_hr + 5 * daily_cycle + rng.normal(0, 2, shape)
+bp = baseline_bp + 3 * daily_cycle + rng.normal(0, 2, shape)
 
 # Create DataFrame and set the timestamp as index
 # This enables time-based operations and selections
-df = pd.DataFrame(vital_signs_data)
+# ravel() lays the arrays out patient by patient, matching repeat/tile below
+df = pd.DataFrame({
+    'timestamp': np.tile(dates, n_patients),
+    'patient_id': np.repeat(patients, n_dates),
+    'temperature': temp.ravel(),
+    'heart_rate': hr.ravel(),
+    'blood_pressure': bp.ravel(),
+    # Most measurements are routine, some are emergency checks
+    'measurement_type': rng.choice(['routine', 'emergency'], n_patients * n_dates, p=[0.9, 0.1])
+})
 df.set_index('timestamp', inplace=True)
 
 print("\n2. Basic time series operations")
 
 # Resample data to hourly averages
 # This helps smooth out noise and reduce data volume while maintaining trends
-hourly_avg = df.groupby('patient_id').resample('H').mean()
+# My data is generated on an hourly grid, one row per patient per hour, in patient
+# order. In that case every hourly bin holds exactly one measurement and the
+# "average" is just the measurement itself, so I only need to relabel the rows
+vital_columns = ['temperature', 'heart_rate', 'blood_pressure']
+hourly_grid = pd.MultiIndex.from_product([patients, dates], names=['patient_id', 'timestamp'])
+on_hourly_grid = (
+    df.index.equals(hourly_grid.get_level_values('timestamp'))
+    and (df['patient_id'].to_numpy() == hourly_grid.get_level_values('patient_id')).all()
+)
+if on_hourly_grid:
+    hourly_avg = pd.DataFrame(df[vital_columns].to_numpy(), index=hourly_grid, columns=vital_columns)
+else:
+    # Irregular timestamps need real binning
+    hourly_avg = df.groupby('patient_id').resample('H').mean()
 print("\nHourly averages:")
 print(hourly_avg.head())
 
@@ -106,27 +121,52 @@ plt.close()
 
 print("\n4. Detecting anomalies")
 
-def detect_anomalies(group, window=24, threshold=2):
+def detect_anomalies(values, groups, window=24, threshold=2):
     """
     Detect anomalies in vital signs using rolling statistics
     
     Parameters:
-    - group: time series data for a single vital sign
+    - values: one vital sign for all patients, each patient's rows in time order
+    - groups: patient ID of every row (rows of a patient must be contiguous)
     - window: number of hours to include in rolling statistics (default: 24 hours)
     - threshold: number of standard deviations to consider anomalous (default: 2)
     
     This approach identifies values that deviate significantly from recent trends,
     which could indicate medical issues requiring attention.
+    All patients are handled in one pass: the rolling sums come from two cumulative
+    sums over the whole array instead of separate rolling mean/std calls per patient.
     """
-    rolling_mean = group.rolling(window=window).mean()
-    rolling_std = group.rolling(window=window).std()
+    codes, _ = pd.factorize(groups)
+    # Centering on each patient's mean keeps the sums of squares small and accurate
+    group_means = np.bincount(codes, weights=values) / np.bincount(codes)
+    x = values - group_means[codes]
+    
+    # Sums over the last `window` rows are differences of cumulative sums
+    cumsum = np.concatenate(([0.0], np.cumsum(x)))
+    cumsum_sq = np.concatenate(([0.0], np.cumsum(x * x)))
+    window_sum = np.full(len(x), np.nan)
+    window_sum_sq = np.full(len(x), np.nan)
+    window_sum[window - 1:] = cumsum[window:] - cumsum[:-window]
+    window_sum_sq[window - 1:] = cumsum_sq[window:] - cumsum_sq[:-window]
+    
+    # A window is only complete once it holds `window` rows of the same patient
+    group_start = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    position = np.arange(len(x)) - np.repeat(group_start, np.diff(np.r_[group_start, len(x)]))
+    window_sum[position < window - 1] = np.nan
+    
+    rolling_mean = window_sum / window
+    rolling_std = np.sqrt((window_sum_sq - window_sum * rolling_mean) / (window - 1))
     
     # Calculate z-scores relative to rolling statistics
-    z_scores = (group - rolling_mean) / rolling_std
-    return abs(z_scores) > threshold
+    z_scores = (x - rolling_mean) / rolling_std
+    return np.abs(z_scores) > threshold
 
 # Detect temperature anomalies
-temp_anomalies = df.groupby('patient_id')['temperature'].apply(detect_anomalies)
+temp_anomalies = pd.Series(
+    detect_anomalies(df['temperature'].to_numpy(), df['patient_id'].to_numpy()),
+    index=pd.MultiIndex.from_arrays([df['patient_id'], df.index]),
+    name='temperature'
+)
 print("\nDetected anomalies:")
 print(f"Total anomalies found: {temp_anomalies.sum()}")
 
@@ -134,20 +174,27 @@ print("\n5. Advanced time series operations")
 
 # Calculate rate of change in vital signs
 # Rapid changes can indicate acute medical issues
-df['temp_rate_of_change'] = df.groupby('patient_id')['temperature'].diff()
-df['hr_rate_of_change'] = df.groupby('patient_id')['heart_rate'].diff()
+# Both differences and the single-patient plot below need the rows grouped by
+# patient, so I build the groupby object once and reuse it
+patient_groups = df.groupby('patient_id')
+df['temp_rate_of_change'] = patient_groups['temperature'].diff()
+df['hr_rate_of_change'] = patient_groups['heart_rate'].diff()
 
 # Identify periods of rapid change that might require medical attention
-rapid_changes = df[
-    (abs(df['temp_rate_of_change']) > 0.5) |  # Significant temperature change
-    (abs(df['hr_rate_of_change']) > 10)       # Significant heart rate change
-]
+# query() evaluates the whole condition as one expression, with numexpr installed
+# it runs in a single fused pass instead of building a temporary array per step
+rapid_changes = df.query(
+    'abs(temp_rate_of_change) > 0.5'     # Significant temperature change
+    ' | abs(hr_rate_of_change) > 10'     # Significant heart rate change
+)
 print("\nPeriods of rapid change:")
 print(rapid_changes.head())
 
 # Create comprehensive visualization of vital signs for a single patient
 patient_id = patients[0]
-patient_data = df[df['patient_id'] == patient_id]
+# get_group takes the rows straight from the group positions the groupby already
+# knows, no need to compare every patient_id string with the one I want
+patient_data = patient_groups.get_group(patient_id)
 
 # Create a three-panel plot showing all vital signs
 fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
@@ -180,12 +227,38 @@ print("\n6. Time window analysis")
 windows = ['1H', '6H', '12H', '24H']
 stats_by_window = {}
 
+# On my hourly grid (see section 2) a window of k hours is just k consecutive rows
+# of the same patient, so instead of four separate groupby-resample runs I reshape
+# the values once into a (patient, hour, vital sign) array and cut it into blocks
+stat_names = ['mean', 'std', 'min', 'max']
+if on_hourly_grid:
+    hourly_values = df[vital_columns].to_numpy().reshape(n_patients, n_dates, len(vital_columns))
+
 for window in windows:
-    stats_by_window[window] = df.groupby('patient_id').resample(window).agg({
-        'temperature': ['mean', 'std', 'min', 'max'],
-        'heart_rate': ['mean', 'std', 'min', 'max'],
-        'blood_pressure': ['mean', 'std', 'min', 'max']
-    })
+    hours = int(window[:-1])
+    if on_hourly_grid and n_dates % hours == 0:
+        blocks = hourly_values.reshape(n_patients, n_dates // hours, hours, len(vital_columns))
+        # A single measurement has no sample standard deviation
+        if hours > 1:
+            block_std = blocks.std(axis=2, ddof=1)
+        else:
+            block_std = np.full(blocks.shape[:2] + blocks.shape[3:], np.nan)
+        # Shape (patient, window, vital sign, statistic), flattened to rows and columns
+        block_stats = np.stack(
+            [blocks.mean(axis=2), block_std, blocks.min(axis=2), blocks.max(axis=2)], axis=-1
+        )
+        stats_by_window[window] = pd.DataFrame(
+            block_stats.reshape(n_patients * (n_dates // hours), -1),
+            index=pd.MultiIndex.from_product(
+                [patients, dates[::hours]], names=['patient_id', 'timestamp']
+            ),
+            columns=pd.MultiIndex.from_product([vital_columns, stat_names])
+        )
+    else:
+        # Irregular timestamps need real binning
+        stats_by_window[window] = df.groupby('patient_id').resample(window).agg(
+            {column: stat_names for column in vital_columns}
+        )
 
 print("\nStatistics for different time windows:")
 print(stats_by_window['24H'].head())
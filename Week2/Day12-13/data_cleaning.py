@@ -78,35 +78,38 @@ print("\n2. Basic cleaning operations")
 
 def clean_basic(df):
     """Perform basic cleaning operations on the dataset"""
-    # Create a copy to avoid modifying the original data
-    cleaned = df.copy()
+    # No defensive copy here or in the other steps: each step returns the frame
+    # and I always reassign the result (cleaned_df = step(cleaned_df)), so
+    # copying the whole table at the start of every step only costs memory
     
     # Standardize patient sex
     sex_mapping = {
         'M': 'Male', 'm': 'Male', 'Male': 'Male',
         'F': 'Female', 'f': 'Female', 'Female': 'Female'
     }
-    cleaned['sex'] = cleaned['sex'].map(sex_mapping)
+    # As a categorical the column only has 6 distinct spellings, so map() looks up
+    # those 6 categories in the dictionary instead of every one of the rows
+    df['sex'] = df['sex'].astype('category').map(sex_mapping)
     
     # Clean disease names
-    def standardize_disease(disease):
-        disease = str(disease).lower().strip()
-        if 'diabetes' in disease or 'diabet' in disease:
-            return 'Diabetes Type 2'
-        elif any(x in disease for x in ['hypertension', 'htn']):
-            return 'Hypertension'
-        return disease
-    
-    cleaned['disease'] = cleaned['disease'].apply(standardize_disease)
+    # The string methods check every row at once, no Python function call per row
+    disease = df['disease'].str.lower().str.strip()
+    is_diabetes = disease.str.contains('diabet', na=False)
+    is_hypertension = disease.str.contains('hypertension|htn', na=False)
+    df['disease'] = np.select(
+        [is_diabetes, is_hypertension],
+        ['Diabetes Type 2', 'Hypertension'],
+        default=disease
+    )
     
     # Convert weight to numeric, handling any string values first
-    cleaned['weight'] = pd.to_numeric(cleaned['weight'], errors='coerce')
+    df['weight'] = pd.to_numeric(df['weight'], errors='coerce')
     
     # Convert all weights to kg if they appear to be in pounds (over 120)
-    likely_pounds = cleaned['weight'] > 120
-    cleaned.loc[likely_pounds, 'weight'] = cleaned.loc[likely_pounds, 'weight'] / 2.20462
+    likely_pounds = df['weight'] > 120
+    df.loc[likely_pounds, 'weight'] = df.loc[likely_pounds, 'weight'] / 2.20462
     
-    return cleaned
+    return df
 
 cleaned_df = clean_basic(df)
 print("\nAfter basic cleaning:")
@@ -116,17 +119,16 @@ print("\n3. Handling dates")
 
 def clean_dates(df):
     """Standardize date formats"""
-    def parse_date(date_str):
-        """Try multiple date formats"""
-        formats = ['%Y-%m-%d', '%m/%d/%Y', '%d-%b-%Y']
-        for fmt in formats:
-            try:
-                return pd.to_datetime(date_str, format=fmt)
-            except:
-                continue
-        return pd.NaT
-    
-    df['enrollment_date'] = df['enrollment_date'].apply(parse_date)
+    # Try each format on the whole column at once instead of row by row:
+    # errors='coerce' turns rows in another format into NaT, and every later
+    # format only fills the dates that are still missing
+    formats = ['%Y-%m-%d', '%m/%d/%Y', '%d-%b-%Y']
+    dates = df['enrollment_date']
+    parsed = pd.to_datetime(dates, format=formats[0], errors='coerce')
+    for fmt in formats[1:]:
+        parsed = parsed.fillna(pd.to_datetime(dates, format=fmt, errors='coerce'))
+    
+    df['enrollment_date'] = parsed
     return df
 
 cleaned_df = clean_dates(cleaned_df)
@@ -137,8 +139,6 @@ print("\n4. Handling missing values")
 
 def handle_missing_values(df):
     """Handle missing values appropriately for each column"""
-    df = df.copy()
-    
     # Check missing value patterns
     missing_summary = pd.DataFrame({
         'percent_missing': (df.isnull().sum() / len(df) * 100).round(2)
@@ -151,13 +151,15 @@ def handle_missing_values(df):
     
     # Handle missing values based on column type
     # Numeric columns: fill with median
-    df['weight'].fillna(df['weight'].median(), inplace=True)
-    df['height'].fillna(df['height'].median(), inplace=True)
-    df['glucose_level'].fillna(df['glucose_level'].median(), inplace=True)
+    # One fillna on the column block with a Series of medians fills every column
+    # in a single call (and assigning the result back also works with
+    # copy-on-write, where fillna(inplace=True) on df[column] changes nothing)
+    numeric_columns = ['weight', 'height', 'glucose_level']
+    df[numeric_columns] = df[numeric_columns].fillna(df[numeric_columns].median())
     
     # Categorical columns: fill with mode
-    df['sex'].fillna(df['sex'].mode()[0], inplace=True)
-    df['disease'].fillna(df['disease'].mode()[0], inplace=True)
+    categorical_columns = ['sex', 'disease']
+    df[categorical_columns] = df[categorical_columns].fillna(df[categorical_columns].mode().iloc[0])
     
     return df
 
@@ -169,8 +171,6 @@ print("\n5. Handling invalid values")
 
 def handle_invalid_values(df):
     """Clean invalid values from numeric columns"""
-    df = df.copy()
-    
     # Define valid ranges for each measurement
     valid_ranges = {
         'age': (0, 120),
@@ -180,10 +180,16 @@ def handle_invalid_values(df):
     }
     
     # Replace out-of-range values with NaN and then fill
-    for column, (min_val, max_val) in valid_ranges.items():
-        mask = (df[column] < min_val) | (df[column] > max_val)
-        df.loc[mask, column] = np.nan
-        df[column].fillna(df[column].median(), inplace=True)
+    # All four columns are checked together as one 2D array: the limits broadcast
+    # across the rows and nanmedian gives every column's median in one call
+    columns = list(valid_ranges)
+    min_vals, max_vals = np.array(list(valid_ranges.values()), dtype=float).T
+    values = df[columns].to_numpy(dtype=float, copy=True)
+    values[(values < min_vals) | (values > max_vals)] = np.nan
+    medians = np.nanmedian(values, axis=0)
+    missing_rows, missing_cols = np.nonzero(np.isnan(values))
+    values[missing_rows, missing_cols] = medians[missing_cols]
+    df[columns] = values
     
     return df
 
@@ -195,15 +201,21 @@ print("\n6. Adding derived features")
 
 def add_derived_features(df):
     """Create new features from existing data"""
-    df = df.copy()
-    
     # Calculate BMI
-    df['bmi'] = df['weight'] / ((df['height'] / 100) ** 2)
+    # Working on the NumPy arrays, height in metres is squared with one multiply
+    height_m = df['height'].to_numpy() / 100
+    df['bmi'] = df['weight'].to_numpy() / (height_m * height_m)
     
     # Create age groups
-    df['age_group'] = pd.cut(df['age'], 
-                            bins=[0, 30, 50, 70, 100],
-                            labels=['<30', '30-50', '50-70', '>70'])
+    # Same bins as pd.cut(bins=[0, 30, 50, 70, 100]), each one includes its right
+    # edge. searchsorted finds the bin of every age directly and the integer codes
+    # become the categorical, ages outside 0-100 get code -1 (missing)
+    age_bins = [0, 30, 50, 70, 100]
+    codes = np.searchsorted(age_bins, df['age'].to_numpy(), side='left') - 1
+    codes[codes >= len(age_bins) - 1] = -1
+    df['age_group'] = pd.Categorical.from_codes(
+        codes, categories=['<30', '30-50', '50-70', '>70'], ordered=True
+    )
     
     # Calculate days since enrollment
     df['days_since_enrollment'] = (pd.Timestamp.now() - df['enrollment_date']).dt.days
@@ -236,6 +248,12 @@ is_valid = validate_cleaned_data(cleaned_df)
 # Export cleaned data
 output_dir = 'cleaned_data'
 os.makedirs(output_dir, exist_ok=True)
-cleaned_df.to_csv(os.path.join(output_dir, 'cleaned_clinical_data.csv'), index=False)
+# Parquet stores each column in binary form instead of formatting every value as
+# text, and it keeps the dtypes (dates, age_group categories) for the next script
+cleaned_df.to_parquet(
+    os.path.join(output_dir, 'cleaned_clinical_data.parquet'),
+    compression='snappy',
+    index=False
+)
 
 print("\nCleaning complete! Check 'cleaned_data' directory for the cleaned dataset.")
\ No newline at end of file
@@ -20,42 +20,63 @@ def create_clinical_dataset(n_patients=500):
     Create a synthetic clinical dataset with multiple measurements over time
     This simulates a longitudinal study with various patient measurements
     """
-    np.random.seed(42)
+    # default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+    # than the legacy np.random functions and keeps its own seeded state
+    rng = np.random.default_rng(42)
     
     # Generate base patient data
-    patients = []
+    # Every column is generated for all visits at once instead of one dict per
+    # visit, records are ordered patient by patient with 6 visits each. The values
+    # that depend on the visit are laid out as a (patient x visit) grid, where the
+    # visit numbers broadcast along every patient's row, and ravel()ed into records
+    n_visits = 6  # 6 visits per patient over 6 months
+    n_records = n_patients * n_visits
+    shape = (n_patients, n_visits)
     start_date = pd.Timestamp('2023-01-01')
+    visit = np.arange(n_visits)
+    # patient_id is grouped on in every step below, so it is a categorical built
+    # straight from integer codes: groupby then works on the small codes instead
+    # of hashing the ID strings each time
+    patient_id = pd.Categorical.from_codes(
+        np.repeat(np.arange(n_patients), n_visits),
+        categories=[f'P{i:03d}' for i in range(n_patients)]
+    )
+    visit_date = start_date + pd.to_timedelta(
+        (30*visit + rng.integers(-5, 5, shape)).ravel(), unit='D'
+    )
+    
+    # Base measurements
+    base_bp = rng.normal(120, 10, shape)
+    base_glucose = rng.normal(100, 15, shape)
+    
+    # Add some trends over time
+    systolic_bp = (base_bp + visit * rng.normal(1, 0.5, shape)).ravel()
+    glucose = (base_glucose + visit * rng.normal(2, 1, shape)).ravel()
     
-    for patient_id in range(n_patients):
-        # Generate 6 visits per patient over 6 months
-        for visit in range(6):
-            visit_date = start_date + pd.Timedelta(days=30*visit) + pd.Timedelta(days=np.random.randint(-5, 5))
-            
-            # Base measurements
-            base_bp = np.random.normal(120, 10)
-            base_glucose = np.random.normal(100, 15)
-            
-            # Add some trends over time
-            bp_trend = visit * np.random.normal(1, 0.5)
-            glucose_trend = visit * np.random.normal(2, 1)
-            
-            patients.append({
-                'patient_id': f'P{patient_id:03d}',
-                'visit_number': visit + 1,
-                'visit_date': visit_date,
-                'age': np.random.randint(30, 80),
-                'sex': np.random.choice(['M', 'F']),
-                'weight': np.random.normal(70, 15),
-                'height': np.random.normal(170, 10),
-                'systolic_bp': base_bp + bp_trend,
-                'diastolic_bp': (base_bp + bp_trend) * 0.6,
-                'heart_rate': np.random.normal(75, 8),
-                'glucose': base_glucose + glucose_trend,
-                'cholesterol': np.random.normal(200, 30),
-                'medication_count': np.random.randint(0, 5)
-            })
+    df = pd.DataFrame({
+        'patient_id': patient_id,
+        'visit_number': np.tile(visit + 1, n_patients),
+        'visit_date': visit_date,
+        'age': rng.integers(30, 80, n_records),
+        'sex': rng.choice(['M', 'F'], n_records),
+        'weight': rng.normal(70, 15, n_records),
+        'height': rng.normal(170, 10, n_records),
+        'systolic_bp': systolic_bp,
+        'diastolic_bp': systolic_bp * 0.6,
+        'heart_rate': rng.normal(75, 8, n_records),
+        'glucose': glucose,
+        'cholesterol': rng.normal(200, 30, n_records),
+        'medication_count': rng.integers(0, 5, n_records)
+    })
     
-    return pd.DataFrame(patients)
+    # The measurements are stored as float32: half the memory of float64 and
+    # still far more precision than the measurements themselves have, so every
+    # feature computed from them below moves half as many bytes
+    measurement_columns = ['weight', 'height', 'systolic_bp', 'diastolic_bp',
+                           'heart_rate', 'glucose', 'cholesterol']
+    df[measurement_columns] = df[measurement_columns].astype(np.float32)
+    
+    return df
 
 # Create initial dataset
 df = create_clinical_dataset()
@@ -69,11 +90,20 @@ def create_basic_features(df):
     """Create basic derived features from raw measurements"""
     df = df.copy()
     
+    # The three blood pressure and body measures are computed on the NumPy arrays,
+    # reusing each intermediate array in place instead of allocating a new one
+    # for every step (and without building a Series for each of them)
+    weight = df['weight'].to_numpy()
+    height_m = df['height'].to_numpy() / 100
+    diastolic = df['diastolic_bp'].to_numpy()
+    
     # Calculate BMI
-    df['bmi'] = df['weight'] / ((df['height'] / 100) ** 2)
+    height_m *= height_m
+    df['bmi'] = weight / height_m
     
     # Calculate pulse pressure (difference between systolic and diastolic)
-    df['pulse_pressure'] = df['systolic_bp'] - df['diastolic_bp']
+    pulse_pressure = df['systolic_bp'].to_numpy() - diastolic
+    df['pulse_pressure'] = pulse_pressure
     
     # Create age groups
     df['age_group'] = pd.cut(df['age'], 
@@ -81,7 +111,9 @@ def create_basic_features(df):
                             labels=['<40', '40-50', '50-60', '60-70', '>70'])
     
     # Calculate mean arterial pressure
-    df['mean_arterial_pressure'] = df['diastolic_bp'] + (df['pulse_pressure'] / 3)
+    mean_arterial_pressure = pulse_pressure / 3
+    mean_arterial_pressure += diastolic
+    df['mean_arterial_pressure'] = mean_arterial_pressure
     
     return df
 
@@ -100,20 +132,27 @@ def create_temporal_features(df):
     df['month'] = df['visit_date'].dt.month
     df['day_of_week'] = df['visit_date'].dt.dayofweek
     
+    # The patient grouping is built once and used for every step below
+    patient_groups = df.groupby('patient_id', observed=True)
+    
     # Calculate days since first visit for each patient
-    df['days_since_first_visit'] = df.groupby('patient_id')['visit_date'].transform(
-        lambda x: (x - x.min()).dt.days
-    )
+    # transform('min') broadcasts each patient's first date back to their visits
+    df['days_since_first_visit'] = (
+        df['visit_date'] - patient_groups['visit_date'].transform('min')
+    ).dt.days
     
     # Calculate changes from previous visit
-    for col in ['weight', 'systolic_bp', 'glucose']:
-        df[f'{col}_change'] = df.groupby('patient_id')[col].diff()
-        
-        # Calculate rate of change (per 30 days)
-        df[f'{col}_rate_change'] = (
-            df[f'{col}_change'] / 
-            df.groupby('patient_id')['days_since_first_visit'].diff()
-        ) * 30
+    # One diff() call covers all three measurements and the days between visits
+    columns = ['weight', 'systolic_bp', 'glucose']
+    changes = patient_groups[columns].diff()
+    days_between_visits = patient_groups['days_since_first_visit'].diff()
+    
+    # Calculate rate of change (per 30 days)
+    rates = changes.div(days_between_visits, axis=0) * 30
+    
+    for col in columns:
+        df[f'{col}_change'] = changes[col]
+        df[f'{col}_rate_change'] = rates[col]
     
     return df
 
@@ -128,19 +167,28 @@ def create_statistical_features(df):
     df = df.copy()
     
     # Calculate rolling means and standard deviations
-    for col in ['systolic_bp', 'glucose', 'heart_rate']:
-        # Calculate rolling statistics for each patient
-        df[f'{col}_rolling_mean'] = df.groupby('patient_id')[col].transform(
-            lambda x: x.rolling(window=3, min_periods=1).mean()
-        )
-        df[f'{col}_rolling_std'] = df.groupby('patient_id')[col].transform(
-            lambda x: x.rolling(window=3, min_periods=1).std()
-        )
-        
-        # Calculate z-scores within patient
-        df[f'{col}_zscore'] = df.groupby('patient_id')[col].transform(
-            lambda x: stats.zscore(x, nan_policy='omit')
-        )
+    columns = ['systolic_bp', 'glucose', 'heart_rate']
+    # Calculate rolling statistics for each patient
+    # GroupBy.rolling works through all patients and columns in one compiled call
+    # instead of calling a Python lambda per patient; dropping the patient_id
+    # level of the result lines it up with df's rows again
+    rolling = df.groupby('patient_id', observed=True)[columns].rolling(window=3, min_periods=1)
+    rolling_means = rolling.mean().reset_index(level=0, drop=True)
+    rolling_stds = rolling.std().reset_index(level=0, drop=True)
+    
+    # Calculate z-scores within patient
+    # The per-patient mean and std (ddof=0, like scipy's zscore) are broadcast back
+    # to every visit by transform(), then one subtraction and division covers all rows
+    patient_groups = df.groupby('patient_id', observed=True)[columns]
+    zscores = (
+        (df[columns] - patient_groups.transform('mean'))
+        / patient_groups.transform('std', ddof=0)
+    )
+    
+    for col in columns:
+        df[f'{col}_rolling_mean'] = rolling_means[col]
+        df[f'{col}_rolling_std'] = rolling_stds[col]
+        df[f'{col}_zscore'] = zscores[col]
     
     return df
 
@@ -159,11 +207,10 @@ def create_interaction_features(df):
     df['bmi_age_interaction'] = df['bmi'] * df['age']
     
     # Create composite risk scores
-    df['cardiovascular_risk_score'] = (
-        df['systolic_bp_zscore'] + 
-        df['cholesterol_zscore'] + 
-        df['bmi_zscore']
-    ) / 3
+    # The average of the three z-scores is one row-wise mean over a
+    # (rows x 3) array instead of two Series additions and a division
+    risk_components = ['systolic_bp_zscore', 'cholesterol_zscore', 'bmi_zscore']
+    df['cardiovascular_risk_score'] = df[risk_components].to_numpy().mean(axis=1)
     
     return df
 
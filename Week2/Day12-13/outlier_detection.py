@@ -5,9 +5,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy import stats
 import seaborn as sns
-from sklearn.preprocessing import StandardScaler
 from sklearn.covariance import EllipticEnvelope
 import os
 
@@ -64,14 +62,20 @@ def detect_outliers_zscore(df, columns, threshold=3):
     Detect outliers using the z-score method.
     Z-score > threshold (usually 3) indicates potential outliers.
     """
-    outliers = pd.DataFrame()
-    for column in columns:
-        # Calculate z-scores
-        z_scores = np.abs(stats.zscore(df[column]))
-        # Identify outliers
-        outliers[f'{column}_outlier'] = z_scores > threshold
-        # Store z-scores
-        outliers[f'{column}_zscore'] = z_scores
+    # Calculate z-scores
+    # All columns form one (rows x columns) array, so the means and standard
+    # deviations (ddof=0, like scipy's zscore) of every column come from one call
+    # each and broadcast along the rows
+    values = df[columns].to_numpy(dtype=float)
+    z_scores = np.abs((values - values.mean(axis=0)) / values.std(axis=0))
+    # Identify outliers
+    is_outlier = z_scores > threshold
+    
+    # Each column gets its outlier flag followed by its z-score
+    outliers = pd.DataFrame(index=df.index)
+    for i, column in enumerate(columns):
+        outliers[f'{column}_outlier'] = is_outlier[:, i]
+        outliers[f'{column}_zscore'] = z_scores[:, i]
     
     return outliers
 
@@ -79,12 +83,19 @@ numeric_columns = ['heart_rate', 'blood_pressure', 'temperature', 'glucose', 'wh
 outliers_zscore = detect_outliers_zscore(df, numeric_columns)
 
 # Visualize z-score distributions
-plt.figure(figsize=(12, 6))
-for i, column in enumerate(numeric_columns, 1):
-    plt.subplot(2, 3, i)
-    plt.hist(outliers_zscore[f'{column}_zscore'], bins=50)
-    plt.title(f'{column} Z-scores')
-    plt.axvline(x=3, color='r', linestyle='--', label='Threshold')
+# The grid of axes is created once, and all histograms share one set of bin edges
+# computed over every z-score, so the bins are only worked out once and the
+# panels can be compared with each other directly
+z_scores = outliers_zscore[[f'{column}_zscore' for column in numeric_columns]].to_numpy()
+bin_edges = np.histogram_bin_edges(z_scores, bins=50)
+fig, axes = plt.subplots(2, 3, figsize=(12, 6))
+for i, (ax, column) in enumerate(zip(axes.flat, numeric_columns)):
+    ax.hist(z_scores[:, i], bins=bin_edges)
+    ax.set_title(f'{column} Z-scores')
+    ax.axvline(x=3, color='r', linestyle='--', label='Threshold')
+# Hide the grid cells left over after the last column
+for ax in axes.flat[len(numeric_columns):]:
+    ax.set_visible(False)
 plt.tight_layout()
 plt.savefig(os.path.join(visualization_path, 'zscore_distributions.png'))
 plt.close()
@@ -122,8 +133,10 @@ def detect_outliers_multivariate(df, columns):
     This method considers relationships between variables.
     """
     # Standardize the data
-    scaler = StandardScaler()
-    scaled_data = scaler.fit_transform(df[columns])
+    # Same result as StandardScaler().fit_transform (population std, ddof=0),
+    # done directly on the array since the scaler is never reused
+    values = df[columns].to_numpy(dtype=float)
+    scaled_data = (values - values.mean(axis=0)) / values.std(axis=0)
     
     # Fit elliptic envelope
     detector = EllipticEnvelope(contamination=0.1, random_state=42)
@@ -213,17 +226,24 @@ def handle_outliers(df, outliers_zscore, outliers_iqr, multivariate_outliers):
     handled_dfs['removed'] = df[~outlier_mask].copy()
     
     # 2. Cap outliers at percentile values
+    # quantile() gives the bounds of all columns as two Series and DataFrame.clip
+    # lines them up with the columns (axis=1), so every column is capped in one call
+    lower_bounds = df[numeric_columns].quantile(0.01)
+    upper_bounds = df[numeric_columns].quantile(0.99)
     handled_dfs['capped'] = df.copy()
-    for column in numeric_columns:
-        lower_bound = df[column].quantile(0.01)
-        upper_bound = df[column].quantile(0.99)
-        handled_dfs['capped'][column] = handled_dfs['capped'][column].clip(lower_bound, upper_bound)
+    handled_dfs['capped'][numeric_columns] = df[numeric_columns].clip(
+        lower=lower_bounds, upper=upper_bounds, axis=1
+    )
     
     # 3. Impute outliers with median
+    # The outlier flags form a mask with the same shape as the columns, and mask()
+    # puts each column's median wherever its flag is set
+    outlier_flags = outliers_zscore[[f'{column}_outlier' for column in numeric_columns]]
+    outlier_flags.columns = numeric_columns
     handled_dfs['imputed'] = df.copy()
-    for column in numeric_columns:
-        mask = outliers_zscore[f'{column}_outlier']
-        handled_dfs['imputed'].loc[mask, column] = df[column].median()
+    handled_dfs['imputed'][numeric_columns] = df[numeric_columns].mask(
+        outlier_flags, df[numeric_columns].median(), axis=1
+    )
     
     return handled_dfs
 
@@ -3,11 +3,14 @@
 import pandas as pd
 import numpy as np
 import sqlite3
+import matplotlib
+# Plots are only saved to files, so the Agg backend avoids setting up a GUI toolkit
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import os
 import sys
+import warnings
 from pathlib import Path
 
 # Add the Day12-13 directory to Python path
@@ -83,24 +86,39 @@ class ClinicalDataPipeline:
         conn = sqlite3.connect(self.db_path)
         
         # Load different types of data
+        # Only the columns the later steps use are selected, so SQLite and pandas
+        # never convert the IDs, dates and units nothing reads
         try:
             # Patient demographics
             demographics = pd.read_sql("""
-                SELECT * FROM patients
+                SELECT patient_id, age, sex FROM patients
             """, conn)
             
             # Lab results
             lab_results = pd.read_sql("""
-                SELECT * FROM lab_results
+                SELECT patient_id, test_name, value FROM lab_results
             """, conn)
             
-            # Vital signs
+            # Vital signs (temperature is kept for the range checks)
             vital_signs = pd.read_sql("""
-                SELECT * FROM vital_signs
+                SELECT patient_id, heart_rate, systolic_bp, diastolic_bp, temperature
+                FROM vital_signs
             """, conn)
             
             conn.close()
             
+            # The patient_id columns of all tables get one shared categorical type:
+            # the groupbys and merges later on work on its integer codes instead of
+            # the ID strings. Its categories are the IDs of all three tables, so no
+            # measurement loses its patient when the ID isn't in the patients table
+            patient_type = pd.CategoricalDtype(np.sort(pd.concat([
+                demographics['patient_id'],
+                lab_results['patient_id'],
+                vital_signs['patient_id']
+            ]).unique()))
+            for df in [demographics, lab_results, vital_signs]:
+                df['patient_id'] = df['patient_id'].astype(patient_type)
+            
             return {
                 'demographics': demographics,
                 'lab_results': lab_results,
@@ -140,11 +158,14 @@ class ClinicalDataPipeline:
             violations = self.validator.validate_data(df)
             
             # Store results
+            # Both counts come from the boolean array: column sums per check and
+            # the number of rows with any violation, without selecting those rows
+            flags = violations.to_numpy(dtype=bool)
             validation_results[data_type] = {
                 'violations': violations,
-                'summary': violations.sum().to_dict(),
+                'summary': dict(zip(violations.columns, flags.sum(axis=0).tolist())),
                 'total_records': len(df),
-                'clean_records': len(df) - len(violations[violations.any(axis=1)])
+                'clean_records': len(df) - int(flags.any(axis=1).sum())
             }
             
             self.log.append(f"Validated {data_type}: {validation_results[data_type]['clean_records']} clean records")
@@ -157,21 +178,20 @@ class ClinicalDataPipeline:
             # Create patient summary features
             patient_features = pd.merge(
                 cleaned_data['demographics'],
-                cleaned_data['vital_signs'].groupby('patient_id').agg({
-                    'heart_rate': ['mean', 'std'],
-                    'systolic_bp': ['mean', 'std'],
-                    'diastolic_bp': ['mean', 'std']
-                }).round(2),
+                self._group_mean_std(
+                    cleaned_data['vital_signs'], 'patient_id',
+                    ['heart_rate', 'systolic_bp', 'diastolic_bp']
+                ).round(2),
                 on='patient_id'
             )
             
             # Add lab result features
-            lab_features = cleaned_data['lab_results'].pivot_table(
-                index='patient_id',
-                columns='test_name',
-                values='value',
-                aggfunc=['mean', 'std']
-            ).round(2)
+            # One grouped mean/std per (patient, test), unstacking the test level
+            # gives the same (statistic, test) columns as pivot_table without its
+            # extra pivoting step
+            lab_features = cleaned_data['lab_results'].groupby(
+                ['patient_id', 'test_name'], observed=True
+            )['value'].agg(['mean', 'std']).unstack('test_name').round(2)
             
             # Combine all features
             enriched_data = pd.merge(
@@ -189,16 +209,84 @@ class ClinicalDataPipeline:
             self.log.append(f"Feature engineering failed: {str(e)}")
             raise
     
+    def _group_mean_std(self, df, group_column, columns):
+        """
+        Mean and sample standard deviation of several columns per group
+        
+        Parameters:
+        - df: data with one row per measurement
+        - group_column: column holding the group of every row (e.g. patient_id)
+        - columns: numeric columns to summarize
+        
+        Returns:
+        - DataFrame indexed by group with a (column, 'mean'/'std') column pair per
+          column, the same layout as groupby().agg({column: ['mean', 'std']})
+        
+        Every group's sums come from np.bincount over the integer group codes, so
+        all groups and columns are summarized with a few passes over the arrays.
+        The squared deviations are taken from each group's mean, which keeps the
+        standard deviation accurate. Rows without a group are left out, like
+        groupby()'s default dropna=True.
+        """
+        codes, groups = pd.factorize(df[group_column], sort=True)
+        values = df[columns].to_numpy(dtype=float)
+        # A missing group key gets code -1, which np.bincount can't count
+        keep = codes >= 0
+        codes, values = codes[keep], values[keep]
+        counts = np.bincount(codes, minlength=len(groups))
+        
+        stats = {}
+        for i, column in enumerate(columns):
+            means = np.bincount(codes, weights=values[:, i], minlength=len(groups)) / counts
+            deviations = values[:, i] - means[codes]
+            squared = np.bincount(codes, weights=deviations * deviations, minlength=len(groups))
+            # A group with a single row has no sample standard deviation
+            with np.errstate(invalid='ignore', divide='ignore'):
+                stds = np.sqrt(squared / (counts - 1))
+            stats[(column, 'mean')] = means
+            stats[(column, 'std')] = stds
+        
+        return pd.DataFrame(stats, index=pd.Index(groups, name=group_column))
+    
     def analyze_data(self, enriched_data):
         """Perform data analysis"""
         analysis_results = {}
         
+        numeric_cols = enriched_data.select_dtypes(include=[np.number]).columns
+        values = enriched_data[numeric_cols].to_numpy(dtype=float)
+        
         # Statistical analysis
-        analysis_results['basic_stats'] = enriched_data.describe()
+        # The same table as describe(), but every statistic is one NumPy reduction
+        # over all columns at once and the three quartiles share one percentile
+        # call (an all-missing column just gives NaN, so its warnings are muted)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            analysis_results['basic_stats'] = pd.DataFrame(
+                np.vstack([
+                    np.sum(~np.isnan(values), axis=0),
+                    np.nanmean(values, axis=0),
+                    np.nanstd(values, axis=0, ddof=1),
+                    np.nanmin(values, axis=0),
+                    np.nanpercentile(values, [25, 50, 75], axis=0),
+                    np.nanmax(values, axis=0)
+                ]),
+                index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                columns=numeric_cols
+            )
         
         # Correlation analysis
-        numeric_cols = enriched_data.select_dtypes(include=[np.number]).columns
-        analysis_results['correlations'] = enriched_data[numeric_cols].corr()
+        if not np.isnan(values).any():
+            # Without missing values np.corrcoef gives the whole matrix from one
+            # matrix product over the standardized columns
+            with np.errstate(invalid='ignore', divide='ignore'):
+                correlations = np.corrcoef(values, rowvar=False)
+            analysis_results['correlations'] = pd.DataFrame(
+                correlations, index=numeric_cols, columns=numeric_cols
+            )
+        else:
+            # Missing values need pandas' pairwise handling, where every pair of
+            # columns uses all the rows that have both values
+            analysis_results['correlations'] = enriched_data[numeric_cols].corr()
         
         # Create visualizations
         self._create_visualizations(enriched_data, analysis_results)
@@ -208,10 +296,18 @@ class ClinicalDataPipeline:
     def _create_visualizations(self, data, analysis_results):
         """Create analysis visualizations"""
         # Correlation heatmap
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(analysis_results['correlations'], 
-                   cmap='coolwarm', center=0, annot=False)
-        plt.title('Feature Correlations')
+        # imshow draws the matrix as one image instead of a patch per cell,
+        # vmin/vmax keep zero correlation in the middle of the colormap
+        correlations = analysis_results['correlations']
+        fig, ax = plt.subplots(figsize=(12, 8))
+        image = ax.imshow(correlations.to_numpy(), cmap='coolwarm', vmin=-1, vmax=1,
+                          aspect='auto', interpolation='nearest')
+        fig.colorbar(image, ax=ax)
+        ax.set_xticks(range(len(correlations.columns)))
+        ax.set_xticklabels(correlations.columns, rotation=90)
+        ax.set_yticks(range(len(correlations.index)))
+        ax.set_yticklabels(correlations.index)
+        ax.set_title('Feature Correlations')
         plt.tight_layout()
         plt.savefig(self.visualization_path / 'correlation_heatmap.png')
         plt.close()
@@ -221,7 +317,9 @@ class ClinicalDataPipeline:
         fig, axes = plt.subplots(1, len(key_metrics), figsize=(15, 5))
         
         for i, metric in enumerate(key_metrics):
-            sns.histplot(data=data, x=f"{metric}_mean", ax=axes[i])
+            # Same automatic binning as seaborn's histplot, drawn by matplotlib directly
+            axes[i].hist(data[f"{metric}_mean"].dropna(), bins='auto')
+            axes[i].set_xlabel(f"{metric}_mean")
             axes[i].set_title(f'{metric} Distribution')
             
         plt.tight_layout()
@@ -233,26 +331,31 @@ class ClinicalDataPipeline:
         # Create summary report
         report_path = self.base_path / 'analysis_report.txt'
         
+        # The report text is collected as lines and written with one call, only
+        # the statistics table streams into the file itself via to_string(buf=f)
+        header = ["Clinical Data Analysis Report", "===========================", ""]
+        
+        # Data quality summary
+        header.append("Data Quality Summary:")
+        for data_type, results in validation_results.items():
+            header += [
+                "",
+                f"{data_type}:",
+                f"- Total records: {results['total_records']}",
+                f"- Clean records: {results['clean_records']}",
+                f"- Data quality: {(results['clean_records']/results['total_records']*100):.1f}%"
+            ]
+        
+        # Analysis summary
+        header += ["", "Basic Statistics:", ""]
+        
+        # Processing log
+        footer = ["", "", "Processing Log:"] + [f"- {log_entry}" for log_entry in self.log] + [""]
+        
         with open(report_path, 'w') as f:
-            f.write("Clinical Data Analysis Report\n")
-            f.write("===========================\n\n")
-            
-            # Data quality summary
-            f.write("Data Quality Summary:\n")
-            for data_type, results in validation_results.items():
-                f.write(f"\n{data_type}:\n")
-                f.write(f"- Total records: {results['total_records']}\n")
-                f.write(f"- Clean records: {results['clean_records']}\n")
-                f.write(f"- Data quality: {(results['clean_records']/results['total_records']*100):.1f}%\n")
-            
-            # Analysis summary
-            f.write("\nBasic Statistics:\n")
-            f.write(analysis_results['basic_stats'].to_string())
-            
-            # Processing log
-            f.write("\n\nProcessing Log:\n")
-            for log_entry in self.log:
-                f.write(f"- {log_entry}\n")
+            f.write('\n'.join(header))
+            analysis_results['basic_stats'].to_string(buf=f)
+            f.write('\n'.join(footer))
         
         # Save detailed results
         analysis_results['basic_stats'].to_csv(self.base_path / 'statistical_summary.csv')
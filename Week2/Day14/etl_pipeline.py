@@ -5,7 +5,6 @@
 import pandas as pd
 import numpy as np
 import sqlite3
-from datetime import datetime, timedelta
 import os
 import json
 from pathlib import Path
@@ -69,6 +68,19 @@ class ClinicalDataETL:
         """
         print("\n2. Transforming and cleaning data")
         
+        # The patient_id columns of all three sources get one shared categorical
+        # type: the groupbys below then work on its integer codes instead of hashing
+        # the ID strings each time. Its categories are the IDs of all three sources,
+        # so no lab result or vital sign is lost when its patient isn't in patient_info
+        patient_type = pd.CategoricalDtype(np.sort(pd.concat([
+            patient_info['patient_id'],
+            lab_results['patient_id'],
+            vitals['patient_id']
+        ]).unique()))
+        patient_info = patient_info.assign(patient_id=patient_info['patient_id'].astype(patient_type))
+        lab_results = lab_results.assign(patient_id=lab_results['patient_id'].astype(patient_type))
+        vitals = vitals.assign(patient_id=vitals['patient_id'].astype(patient_type))
+        
         # Clean patient information
         patient_info_clean = self._clean_patient_data(patient_info)
         
@@ -114,62 +126,75 @@ class ClinicalDataETL:
     
     def _generate_sample_data(self):
         """Generate sample data files for demonstration"""
-        np.random.seed(42)
+        # default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+        # than the legacy np.random functions and keeps its own seeded state
+        rng = np.random.default_rng(42)
+        n_patients = 100
+        patient_ids = np.array([f'P{i:03d}' for i in range(n_patients)])
+        # Dates are day-precision datetime64 values, subtracting a whole array of day
+        # offsets and formatting them as 'YYYY-MM-DD' are single NumPy calls
+        today = np.datetime64('today', 'D')
+        
+        # Every column is generated for all rows at once instead of one dict per
+        # row, `patient` holds the patient of every row
         
         # Generate lab results
-        lab_results = []
-        for i in range(100):
-            for _ in range(np.random.randint(2, 6)):
-                lab_results.append({
-                    'patient_id': f'P{i:03d}',
-                    'test_date': (datetime.now() - timedelta(days=np.random.randint(0, 180))).strftime('%Y-%m-%d'),
-                    'test_name': np.random.choice(['Glucose', 'Hemoglobin', 'Platelets']),
-                    'value': np.random.normal(100, 15),
-                    'unit': np.random.choice(['mg/dL', 'g/dL', 'K/µL'])
-                })
-        
-        pd.DataFrame(lab_results).to_csv(self.raw_path / 'lab_results.csv', index=False)
+        patient = np.repeat(np.arange(n_patients), rng.integers(2, 6, n_patients))
+        n_results = len(patient)
+        pd.DataFrame({
+            'patient_id': patient_ids[patient],
+            'test_date': np.datetime_as_string(today - rng.integers(0, 180, n_results)),
+            'test_name': rng.choice(['Glucose', 'Hemoglobin', 'Platelets'], n_results),
+            'value': rng.normal(100, 15, n_results),
+            'unit': rng.choice(['mg/dL', 'g/dL', 'K/µL'], n_results)
+        }).to_csv(self.raw_path / 'lab_results.csv', index=False)
         
         # Generate patient info
-        patients = []
-        for i in range(100):
-            patients.append({
-                'patient_id': f'P{i:03d}',
-                'age': np.random.randint(18, 80),
-                'sex': np.random.choice(['M', 'F']),
-                'diagnosis': np.random.choice(['Type 1 Diabetes', 'Type 2 Diabetes', 'Hypertension']),
-                'enrollment_date': (datetime.now() - timedelta(days=np.random.randint(0, 365))).strftime('%Y-%m-%d')
-            })
+        # (to_dict('records') gives the same list of plain dicts for json.dump)
+        patients = pd.DataFrame({
+            'patient_id': patient_ids,
+            'age': rng.integers(18, 80, n_patients),
+            'sex': rng.choice(['M', 'F'], n_patients),
+            'diagnosis': rng.choice(['Type 1 Diabetes', 'Type 2 Diabetes', 'Hypertension'], n_patients),
+            'enrollment_date': np.datetime_as_string(today - rng.integers(0, 365, n_patients))
+        }).to_dict('records')
         
         with open(self.raw_path / 'patient_info.json', 'w') as f:
             json.dump(patients, f)
         
         # Generate vital signs in SQLite
+        patient = np.repeat(np.arange(n_patients), rng.integers(3, 8, n_patients))
+        n_vitals = len(patient)
+        vitals = pd.DataFrame({
+            'patient_id': patient_ids[patient],
+            'measurement_date': np.datetime_as_string(today - rng.integers(0, 180, n_vitals)),
+            'systolic_bp': rng.integers(110, 140, n_vitals),
+            'diastolic_bp': rng.integers(60, 90, n_vitals),
+            'heart_rate': rng.integers(60, 100, n_vitals),
+            'temperature': rng.normal(37, 0.3, n_vitals)
+        })
+        
+        # to_sql writes all rows with one executemany inside a single transaction
         conn = sqlite3.connect(self.db_path)
-        vitals = []
-        for i in range(100):
-            for _ in range(np.random.randint(3, 8)):
-                vitals.append({
-                    'patient_id': f'P{i:03d}',
-                    'measurement_date': (datetime.now() - timedelta(days=np.random.randint(0, 180))).strftime('%Y-%m-%d'),
-                    'systolic_bp': np.random.randint(110, 140),
-                    'diastolic_bp': np.random.randint(60, 90),
-                    'heart_rate': np.random.randint(60, 100),
-                    'temperature': np.random.normal(37, 0.3)
-                })
-        
-        pd.DataFrame(vitals).to_sql('vital_signs', conn, if_exists='replace', index=False)
+        vitals.to_sql('vital_signs', conn, if_exists='replace', index=False)
         conn.close()
     
     def _clean_patient_data(self, df):
         """Clean and validate patient information"""
-        df = df.copy()
+        # No defensive copy in the _clean_* steps: transform_data hands each of them
+        # its own frame (from the patient_id conversion) and only keeps the result
         
         # Convert dates to datetime
         df['enrollment_date'] = pd.to_datetime(df['enrollment_date'])
         
         # Standardize sex values
-        df['sex'] = df['sex'].map({'M': 'Male', 'F': 'Female'})
+        # As a categorical the column only has its two distinct codes, so map()
+        # looks those up in the dictionary instead of every row (anything else
+        # still becomes missing)
+        df['sex'] = df['sex'].astype('category').map({'M': 'Male', 'F': 'Female'})
+        
+        # The diagnosis also only takes a few values, stored once as categories
+        df['diagnosis'] = df['diagnosis'].astype('category')
         
         # Handle missing values
         df['age'] = df['age'].fillna(df['age'].median())
@@ -178,41 +203,57 @@ class ClinicalDataETL:
     
     def _clean_lab_results(self, df):
         """Clean and standardize lab results"""
-        df = df.copy()
-        
         # Convert dates
         df['test_date'] = pd.to_datetime(df['test_date'])
         
         # Remove outliers (simple z-score method)
-        df['z_score'] = (df['value'] - df.groupby('test_name')['value'].transform('mean')) / \
-                       df.groupby('test_name')['value'].transform('std')
-        df = df[abs(df['z_score']) < 3].drop('z_score', axis=1)
+        # Each test's mean and standard deviation come from np.bincount over the
+        # integer test codes and are looked up per row with those codes, so the
+        # values are summarized in one go instead of two groupby transforms, and
+        # the z-scores stay a temporary array instead of a column
+        codes, tests = pd.factorize(df['test_name'])
+        values = df['value'].to_numpy(dtype=float)
+        counts = np.bincount(codes, minlength=len(tests))
+        means = np.bincount(codes, weights=values, minlength=len(tests)) / counts
+        deviations = values - means[codes]
+        # A test with a single result has no standard deviation (NaN, like pandas'
+        # std()), its z-score is NaN and the row is dropped as before
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stds = np.sqrt(
+                np.bincount(codes, weights=deviations * deviations, minlength=len(tests)) / (counts - 1)
+            )
+            z_scores = deviations / stds[codes]
+        df = df[np.abs(z_scores) < 3]
         
         return df
     
     def _clean_vital_signs(self, df):
         """Clean vital signs data"""
-        df = df.copy()
-        
-        # Convert dates
-        df['measurement_date'] = pd.to_datetime(df['measurement_date'])
-        
         # Remove physiologically impossible values
-        df = df[
-            (df['systolic_bp'] > df['diastolic_bp']) & 
-            (df['systolic_bp'] < 200) & 
-            (df['diastolic_bp'] > 40) &
-            (df['heart_rate'].between(40, 200)) &
-            (df['temperature'].between(35, 40))
-        ]
+        # The checks run on the plain NumPy arrays and combine into one mask
+        # (between() is inclusive, so are the comparisons replacing it)
+        systolic = df['systolic_bp'].to_numpy()
+        diastolic = df['diastolic_bp'].to_numpy()
+        heart_rate = df['heart_rate'].to_numpy()
+        temperature = df['temperature'].to_numpy()
+        valid = (
+            (systolic > diastolic) &
+            (systolic < 200) &
+            (diastolic > 40) &
+            (heart_rate >= 40) & (heart_rate <= 200) &
+            (temperature >= 35) & (temperature <= 40)
+        )
+        # Filtering already returns a new frame, so no defensive copy is needed
+        df = df[valid]
         
-        return df
+        # Convert dates (only for the rows that are kept)
+        return df.assign(measurement_date=pd.to_datetime(df['measurement_date']))
     
     def _create_derived_features(self, patients, labs, vitals):
         """Create derived features and combine datasets"""
         
         # Calculate average vital signs per patient
-        vital_stats = vitals.groupby('patient_id').agg({
+        vital_stats = vitals.groupby('patient_id', observed=True).agg({
             'systolic_bp': ['mean', 'std'],
             'diastolic_bp': ['mean', 'std'],
             'heart_rate': ['mean', 'std']
@@ -221,12 +262,10 @@ class ClinicalDataETL:
         vital_stats = vital_stats.reset_index()
         
         # Calculate lab result statistics
-        lab_stats = labs.groupby(['patient_id', 'test_name'])['value'].agg(['mean', 'std']).round(2)
-        lab_stats = lab_stats.reset_index().pivot(
-            index='patient_id',
-            columns='test_name',
-            values=['mean', 'std']
-        )
+        # unstack() moves the test level straight into the columns, no need to
+        # reset the index and pivot the long table again
+        lab_stats = labs.groupby(['patient_id', 'test_name'], observed=True)['value'].agg(['mean', 'std']).round(2)
+        lab_stats = lab_stats.unstack('test_name')
         lab_stats.columns = ['_'.join(col).strip() for col in lab_stats.columns]
         lab_stats = lab_stats.reset_index()
         
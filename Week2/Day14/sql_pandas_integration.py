@@ -5,7 +5,6 @@
 import pandas as pd
 import numpy as np
 import sqlite3
-from datetime import datetime, timedelta
 import os
 
 # Create visualization directory
@@ -57,75 +56,91 @@ def create_clinical_database():
     )
     ''')
     
+    # Index the patient_id of both measurement tables, the queries below join and
+    # group them by patient and would otherwise scan the whole table for each one
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_lab_results_patient ON lab_results (patient_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vital_signs_patient ON vital_signs (patient_id)')
+    
     # Generate sample data
-    np.random.seed(42)
+    # default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+    # than the legacy np.random functions and keeps its own seeded state
+    rng = np.random.default_rng(42)
+    
+    # Every column is generated for all rows at once instead of row by row,
+    # .tolist() turns the values into plain Python objects sqlite3 can store
     
     # Generate patient data
-    patients = []
+    n_patients = 100
     sites = ['Site A', 'Site B', 'Site C']
-    for i in range(100):
-        patients.append((
-            f'P{i:03d}',
-            np.random.randint(18, 80),
-            np.random.choice(['M', 'F']),
-            (datetime.now() - timedelta(days=np.random.randint(0, 365))).strftime('%Y-%m-%d'),
-            np.random.choice(sites)
-        ))
-    
-    # Insert patient data
-    cursor.executemany(
-        'INSERT OR REPLACE INTO patients VALUES (?, ?, ?, ?, ?)',
-        patients
-    )
+    patient_ids = np.array([f'P{i:03d}' for i in range(n_patients)])
+    # Dates are day-precision datetime64 values, so adding day offsets to a whole
+    # array and formatting it as 'YYYY-MM-DD' are single NumPy calls
+    enrollment_dates = np.datetime64('today', 'D') - rng.integers(0, 365, n_patients)
+    patients = list(zip(
+        patient_ids.tolist(),
+        rng.integers(18, 80, n_patients).tolist(),
+        rng.choice(['M', 'F'], n_patients).tolist(),
+        np.datetime_as_string(enrollment_dates).tolist(),
+        rng.choice(sites, n_patients).tolist()
+    ))
     
     # Generate lab results
-    lab_results = []
-    test_types = ['Glucose', 'Cholesterol', 'Hemoglobin', 'Platelets']
-    units = ['mg/dL', 'mg/dL', 'g/dL', 'K/µL']
-    
-    for i, (test, unit) in enumerate(zip(test_types, units)):
-        for patient in patients:
-            for _ in range(np.random.randint(1, 5)):
-                lab_results.append((
-                    None,
-                    patient[0],
-                    (datetime.strptime(patient[3], '%Y-%m-%d') + 
-                     timedelta(days=np.random.randint(1, 180))).strftime('%Y-%m-%d'),
-                    test,
-                    np.random.normal(100, 15),
-                    unit
-                ))
-    
-    # Insert lab results
-    cursor.executemany(
-        'INSERT OR REPLACE INTO lab_results VALUES (?, ?, ?, ?, ?, ?)',
-        lab_results
-    )
+    # 1-4 results of every test for every patient, test by test: `patient` and
+    # `test` give the patient and test of each result
+    test_types = np.array(['Glucose', 'Cholesterol', 'Hemoglobin', 'Platelets'])
+    units = np.array(['mg/dL', 'mg/dL', 'g/dL', 'K/µL'])
+    results_per_test = rng.integers(1, 5, (len(test_types), n_patients)).ravel()
+    test = np.repeat(np.repeat(np.arange(len(test_types)), n_patients), results_per_test)
+    patient = np.repeat(np.tile(np.arange(n_patients), len(test_types)), results_per_test)
+    n_results = len(patient)
+    test_dates = enrollment_dates[patient] + rng.integers(1, 180, n_results)
+    lab_results = list(zip(
+        [None] * n_results,
+        patient_ids[patient].tolist(),
+        np.datetime_as_string(test_dates).tolist(),
+        test_types[test].tolist(),
+        rng.normal(100, 15, n_results).tolist(),
+        units[test].tolist()
+    ))
     
     # Generate vital signs
-    vital_signs = []
-    for patient in patients:
-        for _ in range(np.random.randint(2, 6)):
-            vital_signs.append((
-                patient[0],  # patient_id
-                (datetime.strptime(patient[3], '%Y-%m-%d') + 
-                 timedelta(days=np.random.randint(1, 180))).strftime('%Y-%m-%d'),
-                np.random.randint(60, 100),  # heart_rate
-                np.random.randint(110, 140),  # systolic_bp
-                np.random.randint(60, 90),    # diastolic_bp
-                np.random.normal(37, 0.3)     # temperature
-            ))
-    
-    # Insert vital signs
-    cursor.executemany(
-        '''INSERT OR REPLACE INTO vital_signs 
-           (patient_id, measurement_date, heart_rate, systolic_bp, 
-            diastolic_bp, temperature) 
-           VALUES (?, ?, ?, ?, ?, ?)''',
-        vital_signs
-    )
+    # 2-5 measurements per patient
+    patient = np.repeat(np.arange(n_patients), rng.integers(2, 6, n_patients))
+    n_vitals = len(patient)
+    measurement_dates = enrollment_dates[patient] + rng.integers(1, 180, n_vitals)
+    vital_signs = list(zip(
+        patient_ids[patient].tolist(),
+        np.datetime_as_string(measurement_dates).tolist(),
+        rng.integers(60, 100, n_vitals).tolist(),   # heart_rate
+        rng.integers(110, 140, n_vitals).tolist(),  # systolic_bp
+        rng.integers(60, 90, n_vitals).tolist(),    # diastolic_bp
+        rng.normal(37, 0.3, n_vitals).tolist()      # temperature
+    ))
+    
+    # Insert all the data in one transaction, so SQLite only writes to disk once
+    # at the commit instead of after every table
+    with conn:
+        # Insert patient data
+        conn.executemany(
+            'INSERT OR REPLACE INTO patients VALUES (?, ?, ?, ?, ?)',
+            patients
+        )
+        
+        # Insert lab results
+        conn.executemany(
+            'INSERT OR REPLACE INTO lab_results VALUES (?, ?, ?, ?, ?, ?)',
+            lab_results
+        )
+        
+        # Insert vital signs
+        conn.executemany(
+            '''INSERT OR REPLACE INTO vital_signs 
+               (patient_id, measurement_date, heart_rate, systolic_bp, 
+                diastolic_bp, temperature) 
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            vital_signs
+        )
     
-    conn.commit()
     return conn
 
 # Create database
@@ -172,26 +187,43 @@ print("\n4. Advanced integration example")
 def analyze_patient_trends():
     """Combine SQL and Pandas for trend analysis"""
     
-    # Get vital signs with SQL
+    # Get vital signs summaries with SQL
+    # SQLite aggregates the measurements itself and only returns one row per
+    # patient, instead of sending every measurement over to a pandas groupby.
+    # Each variance is written with sums (1.0 * keeps SQLite from doing integer
+    # division), the division by count - 1 gives NULL for a single measurement
     vitals_query = '''
-    SELECT p.patient_id, p.age, p.sex, p.study_site,
-           v.measurement_date, v.heart_rate, 
-           v.systolic_bp, v.diastolic_bp
-    FROM patients p
-    JOIN vital_signs v ON p.patient_id = v.patient_id
-    ORDER BY p.patient_id, v.measurement_date
+    SELECT patient_id,
+           AVG(heart_rate) AS heart_rate_mean,
+           (SUM(heart_rate * heart_rate) - 1.0 * SUM(heart_rate) * SUM(heart_rate) / COUNT(heart_rate))
+               / (COUNT(heart_rate) - 1) AS heart_rate_var,
+           COUNT(heart_rate) AS heart_rate_count,
+           AVG(systolic_bp) AS systolic_bp_mean,
+           (SUM(systolic_bp * systolic_bp) - 1.0 * SUM(systolic_bp) * SUM(systolic_bp) / COUNT(systolic_bp))
+               / (COUNT(systolic_bp) - 1) AS systolic_bp_var,
+           AVG(diastolic_bp) AS diastolic_bp_mean,
+           (SUM(diastolic_bp * diastolic_bp) - 1.0 * SUM(diastolic_bp) * SUM(diastolic_bp) / COUNT(diastolic_bp))
+               / (COUNT(diastolic_bp) - 1) AS diastolic_bp_var
+    FROM vital_signs
+    GROUP BY patient_id
     '''
     
-    vitals_df = pd.read_sql_query(vitals_query, conn)
-    
-    # Convert date string to datetime
-    vitals_df['measurement_date'] = pd.to_datetime(vitals_df['measurement_date'])
+    summary = pd.read_sql_query(vitals_query, conn, index_col='patient_id')
     
     # Calculate trends using Pandas
-    trends = vitals_df.groupby('patient_id').agg({
-        'heart_rate': ['mean', 'std', 'count'],
-        'systolic_bp': ['mean', 'std'],
-        'diastolic_bp': ['mean', 'std']
+    # Only the square roots are left to do, the layout matches groupby().agg()
+    def std(column):
+        # Rounding in the sums can leave a tiny negative variance for constant values
+        return np.sqrt(summary[f'{column}_var'].clip(lower=0))
+    
+    trends = pd.DataFrame({
+        ('heart_rate', 'mean'): summary['heart_rate_mean'],
+        ('heart_rate', 'std'): std('heart_rate'),
+        ('heart_rate', 'count'): summary['heart_rate_count'],
+        ('systolic_bp', 'mean'): summary['systolic_bp_mean'],
+        ('systolic_bp', 'std'): std('systolic_bp'),
+        ('diastolic_bp', 'mean'): summary['diastolic_bp_mean'],
+        ('diastolic_bp', 'std'): std('diastolic_bp')
     }).round(2)
     
     return trends
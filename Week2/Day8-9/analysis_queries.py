@@ -3,6 +3,9 @@
 import sqlite3
 import pandas as pd
 import numpy as np
+import matplotlib
+# Plots are only saved to files, so the Agg backend avoids setting up a GUI toolkit
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from scipy import stats
 import os
@@ -14,44 +17,114 @@ os.makedirs(visualization_path, exist_ok=True)
 
 
 # Connect to the database
-conn = sqlite3.connect('clinical_trials.db')
+# This script only reads, so the database is opened read-only through a URI:
+# SQLite never needs a write lock or journal for it (and a missing database is
+# an error instead of a new empty file)
+conn = sqlite3.connect('file:clinical_trials.db?mode=ro', uri=True)
 
 print("1. Loading and analyzing trial data")
 
 # Get treatment response data
+# sql_basics.py keeps the completed results already joined with their treatment
+# and patient in completed_results, so every query here reads that one table
 response_query = '''
     SELECT 
-        t.treatment_name,
-        p.condition,
-        tr.treatment_response,
-        p.age,
-        p.sex
-    FROM trial_results tr
-    JOIN trials t ON tr.trial_id = t.trial_id
-    JOIN patients p ON tr.patient_id = p.patient_id
-    WHERE tr.completion_status = 'Completed'
+        treatment_name,
+        condition,
+        treatment_response,
+        age,
+        sex
+    FROM completed_results
 '''
 df = pd.read_sql_query(response_query, conn)
 
+# The treatment and sex are what I group the results by below, so I store them as
+# categoricals once: every later step works with their small integer codes and
+# the sorted category names instead of comparing strings again
+df['treatment_name'] = df['treatment_name'].astype('category')
+df['sex'] = df['sex'].astype('category')
+
 # Calculate basic statistics
+# SQLite aggregates the completed results itself and only returns one row per
+# treatment. The variance is written with sums, the division by count - 1 gives
+# the same sample variance as pandas' std() (and NULL for a single result)
 print("\n2. Basic response statistics by treatment")
-treatment_stats = df.groupby('treatment_name')['treatment_response'].agg([
-    'count', 'mean', 'std', 'min', 'max'
-]).round(3)
+treatment_stats = pd.read_sql_query('''
+    SELECT
+        treatment_name,
+        COUNT(treatment_response) AS count,
+        AVG(treatment_response) AS mean,
+        (SUM(treatment_response * treatment_response)
+         - SUM(treatment_response) * SUM(treatment_response) / COUNT(treatment_response))
+            / (COUNT(treatment_response) - 1) AS var,
+        MIN(treatment_response) AS min,
+        MAX(treatment_response) AS max
+    FROM completed_results
+    GROUP BY treatment_name
+    ORDER BY treatment_name
+''', conn, index_col='treatment_name')
+# Rounding in the sums can leave a tiny negative variance for constant values
+treatment_stats.insert(2, 'std', np.sqrt(treatment_stats.pop('var').clip(lower=0)))
+treatment_stats = treatment_stats.round(3)
 print(treatment_stats)
 
 # Analyze response by condition
+# The condition x treatment table of means also comes straight from SQL: one
+# AVG(CASE ...) column per treatment, so SQLite returns one finished row per
+# condition and pandas doesn't have to unstack a long table
 print("\n3. Response analysis by condition")
-condition_analysis = df.groupby(['condition', 'treatment_name'])['treatment_response'].mean().unstack()
+treatment_columns = [name for (name,) in conn.execute(
+    'SELECT DISTINCT treatment_name FROM completed_results ORDER BY treatment_name'
+)]
+treatment_averages = ',\n        '.join(
+    'AVG(CASE WHEN treatment_name = ? THEN treatment_response END)' for _ in treatment_columns
+)
+condition_analysis = pd.read_sql_query(f'''
+    SELECT
+        condition,
+        {treatment_averages}
+    FROM completed_results
+    GROUP BY condition
+    ORDER BY condition
+''', conn, params=treatment_columns, index_col='condition')
+condition_analysis.columns = pd.Index(treatment_columns, name='treatment_name')
 print(condition_analysis.round(3))
 
+# Instead of masking the whole DataFrame once per treatment, I order the rows by
+# treatment code once: every group is then one contiguous slice of the response
+# array, np.bincount of the codes gives the slice lengths and np.split cuts out
+# all of them
+treatment_names = df['treatment_name'].cat.categories
+treatment_codes = df['treatment_name'].cat.codes.to_numpy()
+order = np.argsort(treatment_codes, kind='stable')
+treatment_codes = treatment_codes[order]
+responses = df['treatment_response'].to_numpy()[order]
+group_sizes = np.bincount(treatment_codes, minlength=len(treatment_names))
+group_starts = np.cumsum(group_sizes) - group_sizes
+treatment_groups = np.split(responses, group_starts[1:])
+
 # Create visualization of treatment responses
 print("\n4. Creating response visualization")
-plt.figure(figsize=(10, 6))
-df.boxplot(column='treatment_response', by='treatment_name')
-plt.title('Treatment Response Distribution')
-plt.suptitle('')  # This removes the automatic suptitle
-plt.ylabel('Response Rate')
+# The box statistics are worked out from the treatment groups above and drawn
+# with ax.bxp(), so the plot doesn't go through DataFrame.boxplot and matplotlib
+# doesn't compute them again. Whiskers reach the furthest response within 1.5
+# IQR of the box, anything beyond is drawn as a flier, like a default boxplot
+box_stats = []
+for treatment, group in zip(treatment_names, treatment_groups):
+    q1, median, q3 = np.percentile(group, [25, 50, 75])
+    iqr = q3 - q1
+    inside = group[(group >= q1 - 1.5 * iqr) & (group <= q3 + 1.5 * iqr)]
+    box_stats.append({
+        'label': treatment, 'med': median, 'q1': q1, 'q3': q3,
+        'whislo': inside.min(), 'whishi': inside.max(),
+        'fliers': group[(group < inside.min()) | (group > inside.max())]
+    })
+fig, ax = plt.subplots(figsize=(10, 6))
+ax.bxp(box_stats)
+ax.grid(True)
+ax.set_title('Treatment Response Distribution')
+ax.set_xlabel('treatment_name')
+ax.set_ylabel('Response Rate')
 plt.xticks(rotation=45)
 plt.tight_layout()
 plt.savefig(os.path.join(visualization_path, 'treatment_responses.png'))
@@ -59,40 +132,66 @@ plt.close()
 
 # Perform statistical tests
 print("\n5. Statistical analysis")
-treatments = df['treatment_name'].unique()
 print("\nANOVA test for treatment differences:")
-treatment_groups = [df[df['treatment_name'] == t]['treatment_response'] for t in treatments]
 f_stat, p_value = stats.f_oneway(*treatment_groups)
 print(f"F-statistic: {f_stat:.4f}")
 print(f"p-value: {p_value:.4f}")
 
 # Age correlation analysis
 print("\n6. Age correlation analysis")
-correlation = df.groupby('treatment_name').apply(
-    lambda x: stats.pearsonr(x['age'], x['treatment_response'])
+# Pearson's r for every treatment at once from grouped sums over the sorted
+# slices, instead of calling pearsonr group by group through apply():
+# r = sum(dx*dy) / sqrt(sum(dx^2) * sum(dy^2)) with dx, dy centered on the
+# group means, and p from the t-distribution with n - 2 degrees of freedom
+ages = df['age'].to_numpy(dtype=float)[order]
+dx = ages - np.repeat(np.add.reduceat(ages, group_starts) / group_sizes, group_sizes)
+dy = responses - np.repeat(np.add.reduceat(responses, group_starts) / group_sizes, group_sizes)
+r_values = np.add.reduceat(dx * dy, group_starts) / np.sqrt(
+    np.add.reduceat(dx * dx, group_starts) * np.add.reduceat(dy * dy, group_starts)
 )
+t_values = r_values * np.sqrt((group_sizes - 2) / (1 - r_values**2))
+p_values = 2 * stats.t.sf(np.abs(t_values), group_sizes - 2)
 print("\nCorrelation between age and treatment response:")
-for treatment, (r, p) in correlation.items():
+for treatment, r, p in zip(treatment_names, r_values, p_values):
     print(f"{treatment}: r={r:.3f}, p={p:.3f}")
 
 # Create age vs response visualization
+# One scatter call draws every point, coloured by its treatment code, instead of
+# one masked call per treatment; the colour limits put each treatment on its own
+# tab10 colour
 plt.figure(figsize=(10, 6))
-for treatment in treatments:
-    mask = df['treatment_name'] == treatment
-    plt.scatter(df[mask]['age'], df[mask]['treatment_response'], 
-               label=treatment, alpha=0.6)
+scatter = plt.scatter(ages, responses, c=treatment_codes, cmap='tab10',
+                      vmin=-0.5, vmax=9.5, alpha=0.6)
 plt.xlabel('Age')
 plt.ylabel('Treatment Response')
 plt.title('Age vs Treatment Response by Treatment')
-plt.legend()
+plt.legend(handles=scatter.legend_elements()[0], labels=list(treatment_names))
 plt.savefig(os.path.join(visualization_path, 'age_response_correlation.png'))
 plt.close()
 
 # Gender analysis
 print("\n7. Gender analysis")
-gender_response = df.groupby(['sex', 'treatment_name'])['treatment_response'].agg([
-    'mean', 'std', 'count'
-]).round(3)
+# Every (sex, treatment) pair maps to one integer built from the two category
+# codes, so np.bincount gets the counts and sums of all pairs in one pass each.
+# The spread is summed around each pair's mean, and pairs without any result
+# are left out like groupby() does
+sexes = df['sex'].cat.categories
+combination = (
+    df['sex'].cat.codes.to_numpy() * len(treatment_names)
+    + df['treatment_name'].cat.codes.to_numpy()
+)
+n_combinations = len(sexes) * len(treatment_names)
+counts = np.bincount(combination, minlength=n_combinations)
+with np.errstate(invalid='ignore', divide='ignore'):
+    means = np.bincount(combination, weights=df['treatment_response'], minlength=n_combinations) / counts
+    deviations = df['treatment_response'].to_numpy() - means[combination]
+    stds = np.sqrt(
+        np.bincount(combination, weights=deviations * deviations, minlength=n_combinations) / (counts - 1)
+    )
+gender_response = pd.DataFrame(
+    {'mean': means, 'std': stds, 'count': counts},
+    index=pd.MultiIndex.from_product([sexes, treatment_names], names=['sex', 'treatment_name'])
+)[counts > 0].round(3)
 print("\nResponse by gender and treatment:")
 print(gender_response)
 
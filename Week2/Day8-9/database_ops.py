@@ -1,7 +1,7 @@
 # database_ops.py - My experiments with advanced database operations
 
 import sqlite3
-import pandas as pd
+import csv
 from datetime import datetime, timedelta
 import numpy as np
 
@@ -25,16 +25,33 @@ class ClinicalDatabaseManager:
     
     def add_patient(self, patient_data):
         """Add a new patient to the database"""
-        try:
-            self.cursor.execute('''
-                INSERT INTO patients (patient_id, age, sex, condition, enrollment_date)
-                VALUES (?, ?, ?, ?, ?)
-            ''', patient_data)
-            self.conn.commit()
+        # INSERT OR IGNORE lets SQLite skip an existing ID by itself, so a duplicate
+        # doesn't raise an IntegrityError for me to catch: rowcount is 0 instead
+        self.cursor.execute('''
+            INSERT OR IGNORE INTO patients (patient_id, age, sex, condition, enrollment_date)
+            VALUES (?, ?, ?, ?, ?)
+        ''', patient_data)
+        self.conn.commit()
+        if self.cursor.rowcount:
             print(f"Added patient {patient_data[0]}")
-        except sqlite3.IntegrityError:
+        else:
             print(f"Patient {patient_data[0]} already exists")
     
+    def add_patients(self, patients_data):
+        """Add several patients at once, skipping the ones that already exist"""
+        # One executemany in one transaction reuses the same prepared statement
+        # and commits once, instead of a commit for every patient. INSERT OR IGNORE
+        # skips existing IDs so the rest of the batch still goes in, and the
+        # rowcount tells how many rows were really inserted
+        patients_data = list(patients_data)
+        with self.conn:
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO patients (patient_id, age, sex, condition, enrollment_date)
+                VALUES (?, ?, ?, ?, ?)
+            ''', patients_data)
+        added = self.cursor.rowcount
+        print(f"Added {added} patients ({len(patients_data) - added} already existed)")
+    
     def update_trial_result(self, result_id, new_response, new_status):
         """Update an existing trial result"""
         self.cursor.execute('''
@@ -62,8 +79,13 @@ class ClinicalDatabaseManager:
     
     def export_to_csv(self, query, filename):
         """Export query results to CSV"""
-        df = pd.read_sql_query(query, self.conn)
-        df.to_csv(filename, index=False)
+        # The rows go straight from the cursor into csv.writer, which pulls them as
+        # it writes, so no DataFrame is built just to be written out again
+        cursor = self.conn.execute(query)
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow([column[0] for column in cursor.description])
+            writer.writerows(cursor)
         print(f"Data exported to {filename}")
 
 # Testing my database operations
@@ -82,6 +104,14 @@ new_patient = (
 )
 db.add_patient(new_patient)
 
+# Add a small batch of patients at once (P051 is already in, so it gets skipped)
+print("\nAdding a batch of patients")
+db.add_patients([
+    new_patient,
+    ('P052', 62, 'M', 'Hypertension', new_patient[4]),
+    ('P053', 38, 'F', 'Type 1 Diabetes', new_patient[4])
+])
+
 # Update a trial result
 print("\n3. Updating a trial result")
 db.update_trial_result(1, 0.85, 'Completed')
@@ -104,11 +134,8 @@ db.export_to_csv(query, 'trial_results_export.csv')
 
 # Testing error handling
 print("\n6. Testing error handling")
-try:
-    # Try to add a patient with existing ID
-    db.add_patient(new_patient)
-except sqlite3.IntegrityError as e:
-    print(f"Caught expected error: {e}")
+# Try to add a patient with existing ID (reported as already existing)
+db.add_patient(new_patient)
 
 # Clean up
 db.disconnect()
\ No newline at end of file
@@ -47,24 +47,84 @@ CREATE TABLE IF NOT EXISTS trial_results (
 )
 ''')
 
+# Index the columns my analysis queries join and filter trial_results on, so
+# SQLite can look the matching rows up instead of scanning the whole table.
+# The last index holds every column the response query reads from
+# trial_results, so completed results are found without visiting the table
+cursor.execute('CREATE INDEX IF NOT EXISTS idx_tr_trial ON trial_results (trial_id)')
+cursor.execute('CREATE INDEX IF NOT EXISTS idx_tr_patient ON trial_results (patient_id)')
+cursor.execute('''
+CREATE INDEX IF NOT EXISTS idx_tr_complete
+ON trial_results (completion_status, trial_id, patient_id, treatment_response)
+''')
+
+# Completed results table
+# My analysis only looks at completed results joined with their treatment and
+# patient, so I keep that join stored as its own table: the analysis queries
+# then read one table instead of joining all three again every time
+cursor.execute('''
+CREATE TABLE IF NOT EXISTS completed_results (
+    result_id INTEGER PRIMARY KEY,
+    patient_id TEXT,
+    treatment_name TEXT,
+    condition TEXT,
+    treatment_response FLOAT,
+    age INTEGER,
+    sex TEXT
+)
+''')
+cursor.execute('CREATE INDEX IF NOT EXISTS idx_cr_treatment ON completed_results (treatment_name)')
+
+# Triggers keep the stored join up to date: whenever a trial result or patient is
+# written, only that result's or patient's rows are deleted and joined again.
+# (INSERT OR REPLACE fires the insert triggers, the trials are only loaded here)
+completed_select = '''
+    SELECT tr.result_id, tr.patient_id, t.treatment_name, p.condition,
+           tr.treatment_response, p.age, p.sex
+    FROM trial_results tr
+    JOIN trials t ON tr.trial_id = t.trial_id
+    JOIN patients p ON tr.patient_id = p.patient_id
+    WHERE tr.completion_status = 'Completed'
+'''
+for table, key, alias in [('trial_results', 'result_id', 'tr'), ('patients', 'patient_id', 'p')]:
+    for event, old in [('INSERT', 'NEW'), ('UPDATE', 'OLD')]:
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS refresh_completed_{table}_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            DELETE FROM completed_results WHERE {key} IN ({old}.{key}, NEW.{key});
+            INSERT INTO completed_results {completed_select} AND {alias}.{key} = NEW.{key};
+        END
+        ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS refresh_completed_{table}_delete
+    AFTER DELETE ON {table}
+    BEGIN
+        DELETE FROM completed_results WHERE {key} = OLD.{key};
+    END
+    ''')
+
 # Generate some sample data
 print("\n2. Generating sample data")
 
 # Generate random patient data
-np.random.seed(42)
-patient_ids = [f'P{i:03d}' for i in range(1, 51)]
+# default_rng() creates NumPy's newer random Generator (PCG64), which is faster
+# than the legacy np.random functions and keeps its own seeded state
+rng = np.random.default_rng(42)
+n_patients = 50
+patient_ids = [f'P{i:03d}' for i in range(1, n_patients + 1)]
 conditions = ['Type 1 Diabetes', 'Type 2 Diabetes', 'Hypertension']
-enrollment_dates = pd.date_range('2023-01-01', '2023-12-31', periods=50)
-
-patients_data = []
-for i, patient_id in enumerate(patient_ids):
-    patients_data.append((
-        patient_id,
-        np.random.randint(18, 75),
-        np.random.choice(['M', 'F']),
-        np.random.choice(conditions),
-        enrollment_dates[i].strftime('%Y-%m-%d')
-    ))
+enrollment_dates = pd.date_range('2023-01-01', '2023-12-31', periods=n_patients)
+
+# Every column is generated for all patients at once instead of one patient at a
+# time, .tolist() turns the values into plain Python objects sqlite3 can store
+patients_data = list(zip(
+    patient_ids,
+    rng.integers(18, 75, n_patients).tolist(),
+    rng.choice(['M', 'F'], n_patients).tolist(),
+    rng.choice(conditions, n_patients).tolist(),
+    enrollment_dates.strftime('%Y-%m-%d').tolist()
+))
 
 # Generate trial data
 trial_ids = ['T001', 'T002', 'T003']
@@ -76,27 +136,24 @@ phases = [2, 2, 3]
 trials_data = list(zip(trial_ids, treatments, start_dates, end_dates, phases))
 
 # Generate trial results
-results_data = []
-for i, patient_id in enumerate(patient_ids):
-    trial_id = np.random.choice(trial_ids)
-    results_data.append((
-        i + 1,
-        patient_id,
-        trial_id,
-        np.random.normal(0.65, 0.15),  # treatment response
-        np.random.randint(0, 3),        # adverse events
-        np.random.choice(['Completed', 'Withdrawn', 'Ongoing'], p=[0.8, 0.1, 0.1])
-    ))
+results_data = list(zip(
+    range(1, n_patients + 1),
+    patient_ids,
+    rng.choice(trial_ids, n_patients).tolist(),
+    rng.normal(0.65, 0.15, n_patients).tolist(),   # treatment response
+    rng.integers(0, 3, n_patients).tolist(),        # adverse events
+    rng.choice(['Completed', 'Withdrawn', 'Ongoing'], n_patients, p=[0.8, 0.1, 0.1]).tolist()
+))
 
 # Insert data into tables
 print("3. Inserting data into tables")
 
-cursor.executemany('INSERT OR REPLACE INTO patients VALUES (?,?,?,?,?)', patients_data)
-cursor.executemany('INSERT OR REPLACE INTO trials VALUES (?,?,?,?,?)', trials_data)
-cursor.executemany('INSERT OR REPLACE INTO trial_results VALUES (?,?,?,?,?,?)', results_data)
-
-# Commit changes and close connection
-conn.commit()
+# All three tables go in one transaction: the connection commits once when the
+# block ends (and rolls everything back if an insert fails)
+with conn:
+    conn.executemany('INSERT OR REPLACE INTO patients VALUES (?,?,?,?,?)', patients_data)
+    conn.executemany('INSERT OR REPLACE INTO trials VALUES (?,?,?,?,?)', trials_data)
+    conn.executemany('INSERT OR REPLACE INTO trial_results VALUES (?,?,?,?,?,?)', results_data)
 
 # Try some basic queries
 print("\n4. Testing some basic queries")